@@ -1,11 +1,28 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file
+from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file, Response, stream_with_context, abort
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import or_
-from recipe_extractor import extract_recipe_data
-import json
+from sqlalchemy.dialects.postgresql import JSONB
+from extraction_runs import extraction_runs
+from circuit_breaker import CircuitOpenError, circuit_breakers
+from autocomplete import PrefixIndex
+from browser_watchdog import browser_watchdog
+from page_cache import RenderedPageCache
+from compression import choose_encoding, compress_body, compress_stream, COMPRESSIBLE_MIMETYPES, MIN_COMPRESS_SIZE
+from ingredient_parser import parse_ingredient
+from scaling import QuantityVectorCache, ingredient_vector, scale_vector, servings_count
+from shopping_list import ShoppingList
+from near_duplicates import MinHashIndex, recipe_shingles
+from pantry_index import IngredientIndex
+from snapshot_store import is_digest
+import math
+import orjson
 import os
+import threading
+import time
+import zlib
 import requests
-from datetime import datetime, timezone
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from io import BytesIO
 
 app = Flask(__name__)
@@ -16,6 +33,11 @@ if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres://'):
     app.config['SQLALCHEMY_DATABASE_URI'] = app.config['SQLALCHEMY_DATABASE_URI'].replace('postgres://', 'postgresql://', 1)
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Write JSON columns with orjson (faster, and keeps non-ASCII text searchable)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'json_serializer': lambda obj: orjson.dumps(obj).decode(),
+    'json_deserializer': orjson.loads,
+}
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Production settings
@@ -28,29 +50,60 @@ else:
 
 db = SQLAlchemy(app)
 
+# Native JSON column: JSON1-backed text on SQLite, JSONB on PostgreSQL
+JSONColumn = db.JSON().with_variant(JSONB(), 'postgresql')
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON/HTML responses for clients that accept br or gzip."""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    if encoding == 'identity':
+        return response
+    response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def json_response(payload, status=200):
+    """Serialize a payload with orjson, which is much faster than jsonify for large listings."""
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
 # --- Recipe Database Model ---
 class Recipe(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     image_url = db.Column(db.String(500), nullable=True)
     description = db.Column(db.String(300), nullable=True)
-    # Store ingredients and steps as JSON strings in a text field
-    ingredients = db.Column(db.Text, nullable=False)
-    steps = db.Column(db.Text, nullable=False)
+    # Store ingredients and steps as native JSON lists (see migrate_json_columns.py)
+    ingredients = db.Column(JSONColumn, nullable=False)
+    steps = db.Column(JSONColumn, nullable=False)
     # --- New Nutrition and Serving Fields ---
     servings = db.Column(db.String(50), nullable=True)
     calories = db.Column(db.String(50), nullable=True)
     protein = db.Column(db.String(50), nullable=True)
     fat = db.Column(db.String(50), nullable=True)
     carbs = db.Column(db.String(50), nullable=True)
-    # --- Raw Extracted Text ---
-    raw_text = db.Column(db.Text, nullable=True)
+    # --- Raw Extracted Text (compressed, in recipe_raw_text; loaded on demand) ---
+    raw_text_record = db.relationship('RecipeRawText', uselist=False, lazy='select',
+        cascade='all, delete-orphan')
+    # --- Parsed Ingredients (recipe_ingredient rows, rebuilt from ingredients on write) ---
+    parsed_ingredients = db.relationship('RecipeIngredient', lazy='select', cascade='all, delete-orphan',
+        order_by='RecipeIngredient.position')
+    # --- Extraction Source (snapshot_hash points into snapshot_store) ---
+    source_url = db.Column(db.String(500), nullable=True)
+    snapshot_hash = db.Column(db.String(64), nullable=True, index=True)
     # --- Recipe Usage Tracking ---
     cook_count = db.Column(db.Integer, default=0)
     last_cooked_date = db.Column(db.DateTime, nullable=True)
     # --- Timestamps ---
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
 
     # Association table for the many-to-many relationship between Recipe and Tag
     recipe_tags = db.Table('recipe_tags',
@@ -61,26 +114,118 @@ class Recipe(db.Model):
     tags = db.relationship('Tag', secondary=recipe_tags, lazy='subquery',
         backref=db.backref('recipes', lazy=True))
 
-    def to_dict(self):
-        return {
+    @property
+    def raw_text(self):
+        if self.raw_text_record is None:
+            return None
+        return decompress_text(self.raw_text_record.data)
+
+    @raw_text.setter
+    def raw_text(self, value):
+        if not value:
+            self.raw_text_record = None
+        elif self.raw_text_record is None:
+            self.raw_text_record = RecipeRawText(data=compress_text(value))
+        else:
+            self.raw_text_record.data = compress_text(value)
+
+    def to_dict(self, include_raw_text=False):
+        recipe_dict = {
             'id': self.id,
             'title': self.title,
             'image_url': self.image_url,
             'description': self.description,
-            'ingredients': json.loads(self.ingredients),
-            'steps': json.loads(self.steps),
+            'ingredients': self.ingredients,
+            'steps': self.steps,
             'servings': self.servings,
             'calories': self.calories,
             'protein': self.protein,
             'fat': self.fat,
             'carbs': self.carbs,
-            'raw_text': self.raw_text,
+            'source_url': self.source_url,
             'cook_count': self.cook_count,
             'last_cooked_date': self.last_cooked_date.isoformat() if self.last_cooked_date else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'tags': [tag.name for tag in self.tags]
         }
+        if include_raw_text:
+            recipe_dict['raw_text'] = self.raw_text
+        return recipe_dict
+
+# --- Deletion Log (feeds /recipes/changes) ---
+class RecipeDeletion(db.Model):
+    __tablename__ = 'recipe_deletion'
+    id = db.Column(db.Integer, primary_key=True)
+    recipe_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+
+@db.event.listens_for(Recipe, 'after_delete')
+def log_recipe_deletion(mapper, connection, target):
+    connection.execute(RecipeDeletion.__table__.insert().values(
+        recipe_id=target.id, deleted_at=datetime.now(timezone.utc)))
+
+# --- Raw Text Storage ---
+def compress_text(text):
+    return zlib.compress(text.encode('utf-8'), 6)
+
+def decompress_text(data):
+    return zlib.decompress(data).decode('utf-8')
+
+class RecipeRawText(db.Model):
+    """Scraped caption/page text, zlib-compressed and kept out of the hot recipe table."""
+    __tablename__ = 'recipe_raw_text'
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipe.id', ondelete='CASCADE'), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+# --- Structured Ingredients ---
+class RecipeIngredient(db.Model):
+    """One ingredient line parsed into quantity, unit and canonical name (see ingredient_parser.py)."""
+    __tablename__ = 'recipe_ingredient'
+    id = db.Column(db.Integer, primary_key=True)
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipe.id', ondelete='CASCADE'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)
+    text = db.Column(db.Text, nullable=False)
+    quantity = db.Column(db.Float, nullable=True)
+    # Upper bound when the line gives a range ('2-3 cloves')
+    quantity_max = db.Column(db.Float, nullable=True)
+    unit = db.Column(db.String(20), nullable=True)
+    name = db.Column(db.String(200), nullable=False)
+    note = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (db.Index('ix_recipe_ingredient_name_recipe', 'name', 'recipe_id'),)
+
+    def to_dict(self):
+        return {
+            'text': self.text,
+            'quantity': self.quantity,
+            'quantity_max': self.quantity_max,
+            'unit': self.unit,
+            'name': self.name,
+            'note': self.note,
+        }
+
+def parse_ingredient_rows(ingredients):
+    """Parse ingredient lines into RecipeIngredient rows, skipping section headings."""
+    rows = []
+    for position, line in enumerate(ingredients or []):
+        if not isinstance(line, str):
+            continue
+        parsed = parse_ingredient(line)
+        if parsed['name']:
+            rows.append(RecipeIngredient(position=position, text=line, **parsed))
+    return rows
+
+def replace_parsed_ingredients(recipe_ingredients):
+    """
+    Rebuild the recipe_ingredient rows for {recipe_id: ingredients}, for bulk
+    writers that update Recipe.ingredients without loading the recipes.
+    """
+    db.session.execute(db.delete(RecipeIngredient).where(RecipeIngredient.recipe_id.in_(recipe_ingredients)))
+    for recipe_id, ingredients in recipe_ingredients.items():
+        for row in parse_ingredient_rows(ingredients):
+            row.recipe_id = recipe_id
+            db.session.add(row)
 
 @app.route('/')
 def index():
@@ -96,13 +241,57 @@ def extract():
     manual_login = data.get('manual_login', False)  # Default to False
     
     try:
-        # Use the factory function to get the appropriate extractor
-        recipe_data = extract_recipe_data(url, manual_login=manual_login)
+        # Attach to an in-flight extraction of the same URL rather than opening another browser
+        recipe_data = extraction_runs.start_or_attach(url, manual_login=manual_login).wait()
         return jsonify(recipe_data)
+    except CircuitOpenError as e:
+        print(f"Extraction skipped: {e}")
+        response = jsonify({'error': str(e), 'failure_kind': e.kind})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
     except Exception as e:
         print(f"Error extracting recipe: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/extract/stream')
+def extract_stream():
+    """Stream extraction progress as Server-Sent Events, ending with a result or error event."""
+    url = request.args.get('url', '').strip()
+    if not url:
+        return jsonify({'error': 'URL is missing from the request'}), 400
+
+    run = extraction_runs.start_or_attach(url)
+
+    def sse(event, data):
+        return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+    def generate():
+        for event, data in run.follow():
+            if event == 'heartbeat':
+                yield ": keep-alive\n\n"
+            elif event == 'error':
+                error = {'error': str(data)}
+                if isinstance(data, CircuitOpenError):
+                    error.update(failure_kind=data.kind, retry_after=data.retry_after)
+                yield sse('error', error)
+            else:
+                yield sse(event, data)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/metrics/browsers')
+def browser_metrics():
+    """Live Chrome count and memory across all workers on this machine."""
+    return jsonify(browser_watchdog.metrics())
+
+@app.route('/metrics/circuits')
+def circuit_metrics():
+    """State and failure counts of each extraction host's circuit breaker in this worker."""
+    return jsonify(circuits=circuit_breakers.snapshot())
+
 @app.route('/save', methods=['POST'])
 def save_recipe():
     try:
@@ -115,9 +304,8 @@ def save_recipe():
             title=data['title'],
             image_url=data.get('image_url', ''),
             description=data.get('description', ''),
-            # Convert Python lists to JSON strings for storage
-            ingredients=json.dumps(data['ingredients']),
-            steps=json.dumps(data['steps']),
+            ingredients=data['ingredients'],
+            steps=data['steps'],
             # --- Save New Nutrition Data ---
             servings=data.get('servings'),
             calories=data.get('calories'),
@@ -125,9 +313,13 @@ def save_recipe():
             fat=data.get('fat'),
             carbs=data.get('carbs'),
             # --- Raw Extracted Text ---
-            raw_text=data.get('raw_text', '')
+            raw_text=data.get('raw_text', ''),
+            # --- Extraction Source ---
+            source_url=data.get('source_url'),
+            snapshot_hash=data.get('snapshot_hash') if is_digest(data.get('snapshot_hash')) else None
         )
         
+        new_recipe.parsed_ingredients = parse_ingredient_rows(new_recipe.ingredients)
         db.session.add(new_recipe)
 
         # Handle Tags for new recipe
@@ -142,18 +334,69 @@ def save_recipe():
                     new_recipe.tags.append(tag)
         
         db.session.commit()
-        return jsonify({'success': True, 'message': 'Recipe saved successfully!', 'recipe_id': new_recipe.id})
+        recipe_written(new_recipe, tags_changed=True, content_changed=True)
+        try:
+            near_duplicates = find_near_duplicates(
+                new_recipe.title, [row.name for row in new_recipe.parsed_ingredients], exclude=new_recipe.id)
+        except Exception as e:
+            print(f"⚠️  Could not check for near-duplicates: {e}")
+            near_duplicates = []
+        return jsonify({'success': True, 'message': 'Recipe saved successfully!', 'recipe_id': new_recipe.id,
+                        'near_duplicates': near_duplicates})
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)})
 
+def recipe_listing_query(include_raw_text=False):
+    """
+    Recipe query for listings. Ingredients/steps are read as their stored JSON
+    text so they can be passed straight through to the response without a
+    decode/re-encode round-trip. Rows are (recipe, ingredients_json, steps_json).
+    """
+    ingredients_json = db.cast(Recipe.ingredients, db.Text)
+    steps_json = db.cast(Recipe.steps, db.Text)
+    query = Recipe.query.options(db.defer(Recipe.ingredients), db.defer(Recipe.steps)) \
+        .add_columns(ingredients_json.label('ingredients_json'), steps_json.label('steps_json'))
+    # selectinload (unlike the relationship's default subquery load) works with yield_per
+    query = query.options(db.selectinload(Recipe.tags))
+    if include_raw_text:
+        query = query.options(db.selectinload(Recipe.raw_text_record))
+    return query, ingredients_json
+
+def serialize_listing_row(r, ingredients_raw, steps_raw, include_raw_text=False):
+    recipe_data = {
+        'id': r.id,
+        'title': r.title,
+        'image_url': r.image_url,
+        'description': r.description,
+        'ingredients': orjson.Fragment(ingredients_raw),
+        'steps': orjson.Fragment(steps_raw),
+        'servings': r.servings,
+        'calories': r.calories,
+        'protein': r.protein,
+        'fat': r.fat,
+        'carbs': r.carbs,
+        'cook_count': r.cook_count,
+        'last_cooked_date': r.last_cooked_date.strftime('%Y-%m-%d %H:%M:%S') if r.last_cooked_date else None,
+        'created_at': r.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'updated_at': r.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'tags': [tag.name for tag in r.tags]
+    }
+    if include_raw_text:
+        recipe_data['raw_text'] = r.raw_text
+    return recipe_data
+
+LISTING_BATCH_SIZE = 200
+LISTING_CHUNK_SIZE = 64 * 1024
+
 @app.route('/recipes')
 def get_recipes():
     search_term = request.args.get('search', '')
     sort_order = request.args.get('sort', 'newest')
     tag_filter = request.args.get('tag', '')
+    include_raw_text = request.args.get('include_raw_text', '').lower() == 'true'
 
-    query = Recipe.query
+    query, ingredients_json = recipe_listing_query(include_raw_text)
 
     # Only apply tag filter if a specific tag is selected (not "All")
     if tag_filter and tag_filter != 'All':
@@ -162,7 +405,7 @@ def get_recipes():
     if search_term:
         query = query.filter(or_(
             Recipe.title.ilike(f'%{search_term}%'),
-            Recipe.ingredients.ilike(f'%{search_term}%')
+            ingredients_json.ilike(f'%{search_term}%')
         ))
 
     if sort_order == 'oldest':
@@ -180,35 +423,270 @@ def get_recipes():
     else: # Default to 'newest'
         query = query.order_by(Recipe.created_at.desc())
         
-    recipes = query.all()
-    
-    recipes_data = [{
-        'id': r.id,
-        'title': r.title,
-        'image_url': r.image_url,
-        'description': r.description,
-        'ingredients': json.loads(r.ingredients),
-        'steps': json.loads(r.steps),
-        'servings': r.servings,
-        'calories': r.calories,
-        'protein': r.protein,
-        'fat': r.fat,
-        'carbs': r.carbs,
-        'raw_text': r.raw_text,
-        'cook_count': r.cook_count,
-        'last_cooked_date': r.last_cooked_date.strftime('%Y-%m-%d %H:%M:%S') if r.last_cooked_date else None,
-        'created_at': r.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-        'updated_at': r.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-        'tags': [tag.name for tag in r.tags]
-    } for r in recipes]
-    
-    return jsonify(recipes=recipes_data)
+    # On PostgreSQL, stream rows from a server-side cursor so memory stays bounded by the
+    # batch size and the first bytes go out before the last row is read. An open SQLite
+    # cursor holds the database read lock until the client finishes downloading, blocking
+    # every write meanwhile, so there the rows are fetched up front and only the
+    # serialized chunks are streamed.
+    if db.engine.dialect.name == 'postgresql':
+        rows = query.yield_per(LISTING_BATCH_SIZE)
+    else:
+        rows = query.all()
+
+    def generate():
+        buffer = bytearray(b'{"recipes":[')
+        separator = b''
+        for r, ingredients_raw, steps_raw in rows:
+            buffer += separator
+            buffer += orjson.dumps(serialize_listing_row(r, ingredients_raw, steps_raw, include_raw_text))
+            separator = b','
+            if len(buffer) >= LISTING_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b']}'
+        yield bytes(buffer)
+
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    response = Response(stream_with_context(compress_stream(generate(), encoding)), mimetype='application/json')
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Overlap applied to the client's cursor, so rows whose updated_at was stamped
+# just before a concurrent commit landed are not missed. Clients upsert by id.
+SYNC_CURSOR_OVERLAP = timedelta(seconds=5)
+
+@app.route('/recipes/changes')
+def get_recipe_changes():
+    """
+    Delta-sync feed. Without ?since, returns every recipe. With ?since=<cursor>,
+    returns only recipes created/updated and ids deleted after that cursor.
+    Always returns a new cursor to pass on the next call. Clients apply
+    'deleted' first and then upsert 'recipes' by id; an id never appears in both.
+    """
+    since_param = request.args.get('since', '')
+    include_raw_text = request.args.get('include_raw_text', '').lower() == 'true'
+    # Taken before querying so nothing committed during this request is skipped next time
+    cursor = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    query, _ = recipe_listing_query(include_raw_text)
+    deleted_ids = []
+    if since_param:
+        try:
+            since = datetime.fromisoformat(since_param).replace(tzinfo=None) - SYNC_CURSOR_OVERLAP
+        except ValueError:
+            return jsonify({'error': 'Invalid since cursor'}), 400
+        query = query.filter(Recipe.updated_at > since)
+        deleted_ids = {row.recipe_id for row in db.session.query(RecipeDeletion.recipe_id)
+                       .filter(RecipeDeletion.deleted_at > since)}
+        # SQLite hands a deleted max id to the next new recipe. An id that exists again
+        # belongs to a recipe created after the deletion, which is in 'recipes' already
+        if deleted_ids:
+            reused = {row.id for row in db.session.query(Recipe.id).filter(Recipe.id.in_(deleted_ids))}
+            deleted_ids = sorted(deleted_ids - reused)
+        else:
+            deleted_ids = []
+
+    rows = query.order_by(Recipe.updated_at.asc()).all()
+    return json_response({
+        'recipes': [serialize_listing_row(r, ingredients_raw, steps_raw, include_raw_text)
+                    for r, ingredients_raw, steps_raw in rows],
+        'deleted': deleted_ids,
+        'cursor': cursor.isoformat(),
+        'full': not since_param,
+    })
 
 @app.route('/tags')
 def get_tags():
     tags = Tag.query.all()
     return jsonify(tags=[tag.name for tag in tags])
 
+# --- Autocomplete Indexes ---
+# Built on first use and updated on writes in this worker. Writes made by other
+# gunicorn workers are picked up incrementally every AUTOCOMPLETE_REFRESH_SECONDS.
+tag_autocomplete = PrefixIndex()
+title_autocomplete = PrefixIndex()
+AUTOCOMPLETE_REFRESH_SECONDS = 30
+autocomplete_state = {'synced_at': None, 'checked_at': 0.0}
+autocomplete_lock = threading.Lock()
+
+def index_recipe_title(recipe_id, title, cook_count):
+    cook_count = cook_count or 0
+    title_autocomplete.upsert(recipe_id, title, cook_count, id=recipe_id, title=title, cook_count=cook_count)
+
+def reindex_tag_counts():
+    """Rank tags by how many recipes use them."""
+    recipe_tags = Recipe.recipe_tags
+    counts = db.session.query(Tag.name, db.func.count(recipe_tags.c.recipe_id)) \
+        .outerjoin(recipe_tags, recipe_tags.c.tag_id == Tag.id) \
+        .group_by(Tag.id, Tag.name).all()
+    for name, count in counts:
+        tag_autocomplete.upsert(name, name, count, name=name, count=count)
+    for stale_name in tag_autocomplete.keys() - {name for name, _ in counts}:
+        tag_autocomplete.remove(stale_name)
+
+def refresh_autocomplete():
+    if time.time() - autocomplete_state['checked_at'] < AUTOCOMPLETE_REFRESH_SECONDS:
+        return
+    with autocomplete_lock:
+        if time.time() - autocomplete_state['checked_at'] < AUTOCOMPLETE_REFRESH_SECONDS:
+            return
+        synced_at = autocomplete_state['synced_at']
+        sync_started = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        query = db.session.query(Recipe.id, Recipe.title, Recipe.cook_count)
+        if synced_at is not None:
+            since = synced_at - SYNC_CURSOR_OVERLAP
+            query = query.filter(Recipe.updated_at > since)
+            for (recipe_id,) in db.session.query(RecipeDeletion.recipe_id).filter(RecipeDeletion.deleted_at > since):
+                title_autocomplete.remove(recipe_id)
+        for recipe_id, title, cook_count in query:
+            index_recipe_title(recipe_id, title, cook_count)
+        reindex_tag_counts()
+
+        autocomplete_state['synced_at'] = sync_started
+        autocomplete_state['checked_at'] = time.time()
+
+# --- Ingredient Indexes ---
+# Both built from title and canonical ingredient names on first use and kept
+# current like the autocomplete indexes: MinHash/LSH for near-duplicates, and
+# an inverted name -> recipe ids index for pantry queries
+duplicate_index = MinHashIndex()
+pantry_index = IngredientIndex()
+ingredient_index_state = {'synced_at': None, 'checked_at': 0.0}
+ingredient_index_lock = threading.Lock()
+
+def index_recipe_contents(recipe_id, title, names):
+    duplicate_index.upsert(recipe_id, recipe_shingles(title, names), id=recipe_id, title=title)
+    pantry_index.upsert(recipe_id, names, id=recipe_id, title=title)
+
+def index_recipes_for_ingredients(recipe_query):
+    """Upsert the recipes selected by a (Recipe.id, Recipe.title) query into the ingredient indexes."""
+    titles = dict(recipe_query.all())
+    names = defaultdict(list)
+    rows = db.session.query(RecipeIngredient.recipe_id, RecipeIngredient.name)
+    # Incremental syncs touch a handful of recipes; a full build reads the whole table anyway
+    if len(titles) < 500:
+        rows = rows.filter(RecipeIngredient.recipe_id.in_(titles))
+    for recipe_id, name in rows:
+        if recipe_id in titles:
+            names[recipe_id].append(name)
+    for recipe_id, title in titles.items():
+        index_recipe_contents(recipe_id, title, names[recipe_id])
+
+def refresh_ingredient_indexes():
+    if time.time() - ingredient_index_state['checked_at'] < AUTOCOMPLETE_REFRESH_SECONDS:
+        return
+    with ingredient_index_lock:
+        if time.time() - ingredient_index_state['checked_at'] < AUTOCOMPLETE_REFRESH_SECONDS:
+            return
+        synced_at = ingredient_index_state['synced_at']
+        sync_started = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        query = db.session.query(Recipe.id, Recipe.title)
+        if synced_at is not None:
+            since = synced_at - SYNC_CURSOR_OVERLAP
+            query = query.filter(Recipe.updated_at > since)
+            for (recipe_id,) in db.session.query(RecipeDeletion.recipe_id).filter(RecipeDeletion.deleted_at > since):
+                duplicate_index.remove(recipe_id)
+                pantry_index.remove(recipe_id)
+        index_recipes_for_ingredients(query)
+
+        ingredient_index_state['synced_at'] = sync_started
+        ingredient_index_state['checked_at'] = time.time()
+
+def find_near_duplicates(title, ingredient_names, exclude=None):
+    """Existing recipes whose title/ingredient shingles mostly overlap these."""
+    refresh_ingredient_indexes()
+    matches = duplicate_index.query(recipe_shingles(title, ingredient_names), exclude=exclude)
+    return [{**data, 'similarity': round(score, 2)} for _, score, data in matches]
+
+def forget_recipe_contents(recipe_id):
+    """
+    Drop a recipe from this worker's caches and ingredient indexes after its
+    ingredients were rewritten outside a request. Other workers re-index it on
+    their next sync, since the write bumps updated_at.
+    """
+    recipe_page_cache.invalidate(recipe_id)
+    quantity_vector_cache.invalidate(recipe_id)
+    duplicate_index.remove(recipe_id)
+    pantry_index.remove(recipe_id)
+
+def recipe_written(recipe, tags_changed=False, content_changed=False):
+    """Keep this worker's caches and autocomplete/ingredient indexes current after a recipe write."""
+    recipe_page_cache.invalidate(recipe.id)
+    quantity_vector_cache.invalidate(recipe.id)
+    try:
+        index_recipe_title(recipe.id, recipe.title, recipe.cook_count)
+        if tags_changed:
+            reindex_tag_counts()
+    except Exception as e:
+        print(f"⚠️  Could not update autocomplete index: {e}")
+    if content_changed:
+        try:
+            index_recipe_contents(recipe.id, recipe.title, [row.name for row in recipe.parsed_ingredients])
+        except Exception as e:
+            print(f"⚠️  Could not update ingredient indexes: {e}")
+
+@app.route('/autocomplete')
+def autocomplete():
+    """Typeahead over tag names (ranked by recipe count) and recipe titles (ranked by cook count)."""
+    query = request.args.get('q', '')
+    kind = request.args.get('type', 'all')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+
+    refresh_autocomplete()
+    results = {}
+    if kind in ('all', 'tags'):
+        results['tags'] = tag_autocomplete.search(query, limit)
+    if kind in ('all', 'recipes'):
+        results['recipes'] = title_autocomplete.search(query, limit)
+    return json_response(results)
+
+@app.route('/near_duplicates', methods=['POST'])
+def near_duplicates():
+    """
+    Check a recipe payload ({"recipe": {"title", "ingredients"}}) against the
+    library before saving it, e.g. during a bulk import.
+    """
+    payload = request.get_json(silent=True) or {}
+    data = (payload.get('recipe') if isinstance(payload, dict) else None) or {}
+    if not isinstance(payload, dict) or not isinstance(data, dict) or not isinstance(data.get('ingredients') or [], list) \
+            or not isinstance(data.get('title') or '', str):
+        return jsonify({'error': 'recipe needs a title and a list of ingredients.'}), 400
+    # parse_ingredient_rows skips section headings and anything that isn't a string
+    names = [row.name for row in parse_ingredient_rows(data.get('ingredients'))]
+    exclude = data.get('id') if isinstance(data.get('id'), int) else None
+    return jsonify(near_duplicates=find_near_duplicates(data.get('title') or '', names, exclude=exclude))
+
+MAX_PANTRY_RESULTS = 100
+
+@app.route('/pantry_recipes', methods=['POST'])
+def pantry_recipes():
+    """
+    What can I cook with what I have? Body: {"pantry": ["flour", "2 eggs", ...]},
+    optional "limit" and "min_coverage" (0-1). Recipes are ranked by the share
+    of their ingredients the pantry covers, with the missing ones listed.
+    """
+    data = request.get_json(silent=True) or {}
+    pantry = data.get('pantry') if isinstance(data, dict) else None
+    if not isinstance(pantry, list) or not pantry or not all(isinstance(line, str) for line in pantry):
+        return jsonify({'error': 'pantry must be a non-empty list of strings.'}), 400
+    try:
+        limit = min(int(data.get('limit', 20)), MAX_PANTRY_RESULTS)
+        min_coverage = float(data.get('min_coverage', 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'limit and min_coverage must be numbers.'}), 400
+
+    refresh_ingredient_indexes()
+    pantry_names = {parse_ingredient(line)['name'] for line in pantry}
+    matches = pantry_index.query(pantry_names, min_coverage=min_coverage, limit=max(limit, 1))
+    return json_response({'recipes': [
+        {**result, 'coverage': round(coverage, 3), 'covered': covered, 'missing': missing}
+        for _, coverage, covered, missing, result in matches
+    ]})
+
 @app.route('/proxy_image')
 def proxy_image():
     """Proxy images to handle Instagram CDN authentication issues on mobile."""
@@ -249,11 +727,179 @@ def proxy_image():
         # Return a placeholder image instead of an error
         return redirect('https://placehold.co/400x300?text=Image+Unavailable')
 
+# --- Rendered Recipe Page Cache ---
+recipe_page_cache = RenderedPageCache()
+# Part of every page version, so a deploy with a changed template doesn't serve old HTML
+RECIPE_TEMPLATE_VERSION = os.path.getmtime(os.path.join(app.root_path, 'templates', 'recipe.html'))
+
+def cached_page_response(page):
+    """Serve a cached page pre-compressed for the client's Accept-Encoding, honoring If-None-Match."""
+    if page.etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        response = app.response_class(page.bodies[encoding], mimetype='text/html')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(page.etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Always revalidate; a matching ETag costs only the version lookup below
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/recipe/<int:recipe_id>')
 def get_recipe(recipe_id):
-    """Display a single recipe."""
-    recipe = Recipe.query.get_or_404(recipe_id)
-    return render_template('recipe.html', recipe=recipe.to_dict())
+    """Display a single recipe, rendered once per version of its content and cook stats."""
+    version = db.session.query(Recipe.updated_at, Recipe.cook_count, Recipe.last_cooked_date) \
+        .filter(Recipe.id == recipe_id).first()
+    if version is None:
+        abort(404)
+    version = (RECIPE_TEMPLATE_VERSION, *version)
+
+    page = recipe_page_cache.get(recipe_id, version)
+    if page is None:
+        recipe = db.session.get(Recipe, recipe_id)
+        html = render_template('recipe.html', recipe=recipe.to_dict(include_raw_text=True))
+        page = recipe_page_cache.put(recipe_id, version, html)
+    return cached_page_response(page)
+
+# --- Recipe Scaling ---
+# Parsed quantity vectors per recipe, rebuilt from recipe_ingredient only when
+# the recipe's updated_at changes, so scaling is arithmetic on cached values
+quantity_vector_cache = QuantityVectorCache()
+MAX_SCALE_RECIPES = 100
+# Largest factor or target servings accepted; beyond this the amounts are meaningless
+MAX_SCALE_AMOUNT = 1000
+
+def load_quantity_vectors(recipe_ids):
+    """Return {recipe_id: (title, servings, vectors)} for the recipes that exist."""
+    recipes = {recipe_id: (title, servings, updated_at) for recipe_id, title, servings, updated_at in
+               db.session.query(Recipe.id, Recipe.title, Recipe.servings, Recipe.updated_at)
+               .filter(Recipe.id.in_(recipe_ids))}
+    vectors, missing = quantity_vector_cache.get_many(
+        {recipe_id: updated_at for recipe_id, (_, _, updated_at) in recipes.items()})
+    if missing:
+        loaded = {recipe_id: [] for recipe_id in missing}
+        rows = db.session.query(RecipeIngredient.recipe_id, RecipeIngredient.text, RecipeIngredient.quantity,
+                                RecipeIngredient.quantity_max, RecipeIngredient.unit, RecipeIngredient.name) \
+            .filter(RecipeIngredient.recipe_id.in_(missing)) \
+            .order_by(RecipeIngredient.recipe_id, RecipeIngredient.position)
+        for recipe_id, text, quantity, quantity_max, unit, name in rows:
+            loaded[recipe_id].append(ingredient_vector(text, quantity, quantity_max, unit, name))
+        for recipe_id, recipe_vectors in loaded.items():
+            quantity_vector_cache.put(recipe_id, recipes[recipe_id][2], recipe_vectors)
+        vectors.update(loaded)
+    return {recipe_id: (title, servings, vectors[recipe_id]) for recipe_id, (title, servings, _) in recipes.items()}
+
+@app.route('/scale', methods=['POST'])
+def scale_recipes():
+    """
+    Scale the ingredients of one or many recipes. Body: {"recipe_ids": [...]}
+    plus either "factor" or a target "servings", and optionally "fixed": a
+    list of canonical ingredient names to leave unscaled. Lines seasoned to
+    taste, pinches/dashes and lines without a quantity are never scaled.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Body must be a JSON object.'}), 400
+    recipe_ids = data.get('recipe_ids')
+    if recipe_ids is None and 'recipe_id' in data:
+        recipe_ids = [data['recipe_id']]
+    if not isinstance(recipe_ids, list) or not recipe_ids or len(recipe_ids) > MAX_SCALE_RECIPES:
+        return jsonify({'error': f'recipe_ids must be a list of 1 to {MAX_SCALE_RECIPES} ids.'}), 400
+    try:
+        recipe_ids = [int(recipe_id) for recipe_id in recipe_ids]
+        factor = float(data['factor']) if data.get('factor') is not None else None
+        target_servings = float(data['servings']) if data.get('servings') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'recipe_ids, factor and servings must be numbers.'}), 400
+    amount = factor if factor is not None else target_servings
+    if (factor is None) == (target_servings is None) or not math.isfinite(amount) \
+            or not 0 < amount <= MAX_SCALE_AMOUNT:
+        return jsonify({'error': f'Give either a factor or a target servings between 0 and {MAX_SCALE_AMOUNT}.'}), 400
+    fixed = data.get('fixed') or []
+    if not isinstance(fixed, list) or not all(isinstance(name, str) for name in fixed):
+        return jsonify({'error': 'fixed must be a list of ingredient names.'}), 400
+    fixed_names = set(fixed)
+
+    recipes = load_quantity_vectors(recipe_ids)
+    results = []
+    for recipe_id in recipe_ids:
+        if recipe_id not in recipes:
+            results.append({'id': recipe_id, 'error': 'Recipe not found.'})
+            continue
+        title, servings, vectors = recipes[recipe_id]
+        recipe_factor = factor
+        if target_servings is not None:
+            base_servings = servings_count(servings)
+            if not base_servings:
+                results.append({'id': recipe_id, 'title': title, 'error': 'Recipe has no servings to scale from.'})
+                continue
+            recipe_factor = target_servings / base_servings
+        results.append({
+            'id': recipe_id,
+            'title': title,
+            'servings': servings,
+            'factor': round(recipe_factor, 4),
+            'ingredients': [scale_vector(vector, recipe_factor, fixed_names) for vector in vectors],
+        })
+    return json_response({'recipes': results})
+
+# --- Shopping List ---
+MAX_SHOPPING_LIST_RECIPES = 200
+
+@app.route('/shopping_list', methods=['POST'])
+def shopping_list():
+    """
+    Combined grocery list for a meal plan. Body: {"recipes": [{"id": 1,
+    "multiplier": 2}, ...]} (or "recipe_ids" for multiplier 1) and an optional
+    "pantry" list of lines already on hand ("olive oil", "2 cups flour").
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Body must be a JSON object.'}), 400
+    entries = data.get('recipes')
+    if entries is None:
+        recipe_ids = data.get('recipe_ids') or []
+        entries = [{'id': recipe_id} for recipe_id in recipe_ids] if isinstance(recipe_ids, list) else None
+    if not isinstance(entries, list) or not entries or len(entries) > MAX_SHOPPING_LIST_RECIPES:
+        return jsonify({'error': f'Give 1 to {MAX_SHOPPING_LIST_RECIPES} recipes.'}), 400
+    multipliers = {}
+    try:
+        for entry in entries:
+            recipe_id = int(entry['id'])
+            multiplier = float(entry.get('multiplier', 1))
+            if not math.isfinite(multiplier) or not 0 < multiplier <= MAX_SCALE_AMOUNT:
+                raise ValueError
+            # The same recipe twice in a plan means cooking it twice
+            multipliers[recipe_id] = multipliers.get(recipe_id, 0) + multiplier
+    except (TypeError, KeyError, ValueError, AttributeError):
+        return jsonify({'error': f'Each recipe needs an id and an optional multiplier between 0 and '
+                                 f'{MAX_SCALE_AMOUNT}.'}), 400
+    pantry = data.get('pantry') or []
+    if not isinstance(pantry, list) or not all(isinstance(line, str) for line in pantry):
+        return jsonify({'error': 'pantry must be a list of strings.'}), 400
+
+    # One query for every ingredient row of every recipe in the plan
+    rows = db.session.query(Recipe.id, RecipeIngredient.text, RecipeIngredient.quantity,
+                            RecipeIngredient.quantity_max, RecipeIngredient.unit, RecipeIngredient.name) \
+        .outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id) \
+        .filter(Recipe.id.in_(multipliers)) \
+        .all()
+
+    shopping = ShoppingList()
+    found_ids = set()
+    for recipe_id, text, quantity, quantity_max, unit, name in rows:
+        found_ids.add(recipe_id)
+        if name is not None:
+            shopping.add(recipe_id, text, quantity, quantity_max, unit, name, multipliers[recipe_id])
+    covered = shopping.subtract_pantry(pantry)
+
+    return json_response({
+        'items': shopping.to_list(),
+        'covered_by_pantry': covered,
+        'missing_recipe_ids': sorted(set(multipliers) - found_ids),
+    })
 
 @app.route('/update_recipe/<int:recipe_id>', methods=['POST'])
 def update_recipe(recipe_id):
@@ -269,17 +915,26 @@ def update_recipe(recipe_id):
         recipe.title = data['title']
         recipe.image_url = data.get('image_url', '')
         recipe.description = data.get('description', '')
-        recipe.ingredients = json.dumps(data['ingredients'])
-        recipe.steps = json.dumps(data['steps'])
+        if recipe.ingredients != data['ingredients']:
+            recipe.parsed_ingredients = parse_ingredient_rows(data['ingredients'])
+        recipe.ingredients = data['ingredients']
+        recipe.steps = data['steps']
         recipe.servings = data.get('servings')
         recipe.calories = data.get('calories')
         recipe.protein = data.get('protein')
         recipe.fat = data.get('fat')
         recipe.carbs = data.get('carbs')
         recipe.raw_text = data.get('raw_text', '')
+        if 'source_url' in data:
+            recipe.source_url = data['source_url']
+        if is_digest(data.get('snapshot_hash')):
+            recipe.snapshot_hash = data['snapshot_hash']
         
         # Clear existing tags and add new ones
         recipe.tags.clear()
+        # Tag and raw text changes don't touch the recipe row, so bump updated_at
+        # explicitly to keep /recipes/changes consistent
+        recipe.updated_at = datetime.now(timezone.utc)
         if 'tags' in data:
             for tag_name in data['tags']:
                 tag_name = tag_name.strip()
@@ -291,6 +946,7 @@ def update_recipe(recipe_id):
                     recipe.tags.append(tag)
         
         db.session.commit()
+        recipe_written(recipe, tags_changed=True, content_changed=True)
         return jsonify({'success': True, 'message': 'Recipe updated successfully!'})
     except Exception as e:
         db.session.rollback()
@@ -309,6 +965,7 @@ def mark_cooked(recipe_id):
         recipe.last_cooked_date = datetime.now(timezone.utc)
         
         db.session.commit()
+        recipe_written(recipe)
         
         return jsonify({
             'success': True, 
@@ -331,6 +988,7 @@ def reset_cook_count(recipe_id):
         recipe.last_cooked_date = None
         
         db.session.commit()
+        recipe_written(recipe)
         
         return jsonify({
             'success': True, 
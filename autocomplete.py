@@ -0,0 +1,93 @@
+import heapq
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+# Queries longer than this are looked up by their first MAX_PREFIX_LENGTH
+# characters and then filtered, which keeps the prefix table bounded.
+MAX_PREFIX_LENGTH = 12
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse punctuation so 'Crème Brûlée' matches 'creme br'."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+
+def searchable_terms(label):
+    """The full label plus every word-suffix, so 'chicken tikka masala' matches 'tikka m'."""
+    words = normalize(label).split()
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+class PrefixIndex:
+    """
+    In-memory typeahead index. Every prefix (up to MAX_PREFIX_LENGTH) of every
+    searchable term maps to the set of entries containing it, and the top-N
+    ranked results per prefix are cached until an entry under that prefix
+    changes, so repeated lookups are a couple of dict hits.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._prefixes = defaultdict(set)
+        self._top_cache = {}
+        self._lock = threading.Lock()
+
+    def _prefixes_for(self, terms):
+        prefixes = {''}
+        for term in terms:
+            for length in range(1, min(len(term), MAX_PREFIX_LENGTH) + 1):
+                prefixes.add(term[:length])
+        return prefixes
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for prefix in self._prefixes_for(entry['terms']):
+            keys = self._prefixes.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._prefixes[prefix]
+            self._top_cache.pop(prefix, None)
+
+    def upsert(self, key, label, score, **data):
+        terms = searchable_terms(label)
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = {'terms': terms, 'score': score, 'result': data}
+            for prefix in self._prefixes_for(terms):
+                self._prefixes[prefix].add(key)
+                self._top_cache.pop(prefix, None)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove_locked(key)
+
+    def keys(self):
+        with self._lock:
+            return set(self._entries)
+
+    def search(self, query, limit=10):
+        """Return up to limit results whose terms start with query, highest score first."""
+        query = normalize(query)
+        lookup = query[:MAX_PREFIX_LENGTH]
+        with self._lock:
+            cache_key = (lookup, limit)
+            if len(query) <= MAX_PREFIX_LENGTH and cache_key in self._top_cache.get(lookup, {}):
+                return self._top_cache[lookup][cache_key]
+
+            candidates = self._prefixes.get(lookup, ())
+            if len(query) > MAX_PREFIX_LENGTH:
+                candidates = [key for key in candidates
+                              if any(term.startswith(query) for term in self._entries[key]['terms'])]
+            top = heapq.nlargest(limit, candidates, key=lambda key: self._entries[key]['score'])
+            results = [self._entries[key]['result'] for key in top]
+
+            if len(query) <= MAX_PREFIX_LENGTH:
+                self._top_cache.setdefault(lookup, {})[cache_key] = results
+            return results
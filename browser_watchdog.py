@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+
+import psutil
+
+from chrome_profiles import profile_manager
+
+
+class BrowserWatchdog:
+    """
+    Track every chromedriver/Chrome process tree started by setup_driver() and
+    kill trees that exceed the memory or wall-clock limit. The wall-clock limit
+    sits below gunicorn's 120s timeout so the extractor's finally block still
+    runs. Each tree is also recorded on disk with its owning worker's pid, so a
+    new worker can reap browsers left behind by a worker gunicorn killed.
+    """
+
+    def __init__(self, max_rss_mb=None, max_seconds=None, interval=5):
+        self.max_rss_bytes = int(max_rss_mb or os.environ.get('BROWSER_MAX_RSS_MB', '700')) * 1024 * 1024
+        self.max_seconds = int(max_seconds or os.environ.get('BROWSER_MAX_SECONDS', '110'))
+        self.interval = interval
+        self.records_path = os.path.join(profile_manager.slots_path, 'browsers')
+        self._browsers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _record_path(self, driver_pid):
+        return os.path.join(self.records_path, f'{driver_pid}.json')
+
+    def _tree(self, pid):
+        """The chromedriver process and all its Chrome descendants that are still alive."""
+        try:
+            root = psutil.Process(pid)
+            return [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    def _tree_rss(self, processes):
+        rss = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return rss
+
+    def _kill_tree(self, pid, reason):
+        processes = self._tree(pid)
+        if not processes:
+            return False
+        print(f"🔪 Killing browser tree {pid} ({len(processes)} processes): {reason}")
+        for process in reversed(processes):
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                continue
+        psutil.wait_procs(processes, timeout=5)
+        return True
+
+    def register(self, driver, time_limit=True):
+        """
+        Start tracking a driver's process tree. Safe to call if the watchdog isn't
+        running yet. Pass time_limit=False for browsers a person is driving (manual
+        login), which only the memory limit applies to.
+        """
+        driver_pid = driver.service.process.pid
+        started = time.time()
+        with self._lock:
+            self._browsers[driver_pid] = (started, time_limit)
+        try:
+            os.makedirs(self.records_path, exist_ok=True)
+            with open(self._record_path(driver_pid), 'w') as f:
+                json.dump({'driver_pid': driver_pid, 'owner_pid': os.getpid(), 'started': started}, f)
+        except OSError as e:
+            print(f"⚠️  Could not record browser process: {e}")
+        self.start()
+
+    def unregister(self, driver):
+        try:
+            driver_pid = driver.service.process.pid
+        except AttributeError:
+            return
+        with self._lock:
+            self._browsers.pop(driver_pid, None)
+        try:
+            os.remove(self._record_path(driver_pid))
+        except FileNotFoundError:
+            pass
+
+    def enforce_limits(self):
+        with self._lock:
+            browsers = dict(self._browsers)
+        for driver_pid, (started, time_limit) in browsers.items():
+            processes = self._tree(driver_pid)
+            if not processes:
+                with self._lock:
+                    self._browsers.pop(driver_pid, None)
+                continue
+            elapsed = time.time() - started
+            rss = self._tree_rss(processes)
+            if time_limit and elapsed > self.max_seconds:
+                self._kill_tree(driver_pid, f"running for {elapsed:.0f}s (limit {self.max_seconds}s)")
+            elif rss > self.max_rss_bytes:
+                self._kill_tree(driver_pid, f"using {rss / 1024 / 1024:.0f} MB (limit {self.max_rss_bytes // 1024 // 1024} MB)")
+            else:
+                continue
+            # The extractor's own calls now fail and its finally block unregisters;
+            # drop the tracking here too in case that never runs
+            with self._lock:
+                self._browsers.pop(driver_pid, None)
+            try:
+                os.remove(self._record_path(driver_pid))
+            except FileNotFoundError:
+                pass
+
+    def reap_orphans(self):
+        """Kill browser trees whose owning worker is gone, plus any of our Chrome processes left parentless."""
+        reaped = 0
+        if os.path.isdir(self.records_path):
+            for name in os.listdir(self.records_path):
+                path = os.path.join(self.records_path, name)
+                try:
+                    with open(path) as f:
+                        record = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if psutil.pid_exists(record['owner_pid']) and record['owner_pid'] != os.getpid():
+                    continue
+                if record['owner_pid'] == os.getpid() and record['driver_pid'] in self._browsers:
+                    continue
+                if self._kill_tree(record['driver_pid'], f"orphaned by worker {record['owner_pid']}"):
+                    reaped += 1
+                os.remove(path)
+
+        for process in psutil.process_iter(['pid', 'ppid', 'cmdline']):
+            try:
+                cmdline = ' '.join(process.info['cmdline'] or [])
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if process.info['ppid'] == 1 and profile_manager.slots_path in cmdline:
+                if self._kill_tree(process.info['pid'], "parentless Chrome process"):
+                    reaped += 1
+
+        if reaped:
+            print(f"🧹 Reaped {reaped} orphaned browser trees.")
+        return reaped
+
+    def metrics(self):
+        """Machine-wide count and memory of Chrome processes using our profile slots."""
+        browsers = 0
+        processes = 0
+        rss = 0
+        for process in psutil.process_iter(['cmdline', 'memory_info']):
+            try:
+                cmdline = process.info['cmdline'] or []
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if not any(profile_manager.slots_path in arg for arg in cmdline):
+                continue
+            processes += 1
+            if process.info['memory_info']:
+                rss += process.info['memory_info'].rss
+            # Only the browser process itself has no --type= switch
+            if not any(arg.startswith('--type=') for arg in cmdline):
+                browsers += 1
+        return {
+            'live_browsers': browsers,
+            'browser_processes': processes,
+            'browser_rss_mb': round(rss / 1024 / 1024, 1),
+            'tracked_in_this_worker': len(self._browsers),
+            'max_rss_mb': self.max_rss_bytes // 1024 // 1024,
+            'max_seconds': self.max_seconds,
+        }
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.enforce_limits()
+            except Exception as e:
+                print(f"⚠️  Browser watchdog error: {e}")
+
+    def start(self):
+        """Reap leftovers from dead workers and start the limit-enforcing thread (once per process)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='browser-watchdog', daemon=True)
+        try:
+            self.reap_orphans()
+        except Exception as e:
+            print(f"⚠️  Could not reap orphaned browsers: {e}")
+        self._thread.start()
+
+
+browser_watchdog = BrowserWatchdog()
@@ -0,0 +1,152 @@
+import fcntl
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+# Files that carry login state. Only these are cloned into each slot, so a
+# fresh slot costs a few hundred KB instead of a full Chrome profile.
+SESSION_FILES = [
+    'Local State',
+    'Default/Preferences',
+    'Default/Secure Preferences',
+    'Default/Cookies',
+    'Default/Cookies-journal',
+    'Default/Network/Cookies',
+    'Default/Network/Cookies-journal',
+    'Default/Local Storage',
+    'Default/Session Storage',
+]
+
+# Chrome's per-profile process locks; stale copies block a new browser from starting
+SINGLETON_FILES = ['SingletonLock', 'SingletonCookie', 'SingletonSocket']
+
+VERSION_FILE = '.profile_version'
+# A login made by hand in the master profile (e.g. for NYTimes) only shows up
+# here, so these are part of the version slots are compared against
+COOKIE_FILES = ['Default/Cookies', 'Default/Network/Cookies']
+
+
+class SlotsBusyError(Exception):
+    """Every profile slot stayed taken for the whole acquire timeout."""
+
+
+class ChromeProfileManager:
+    """
+    Hand out per-slot copies of the logged-in master Chrome profile so several
+    browsers (across threads and gunicorn workers) can run at once. Chrome
+    refuses to open one --user-data-dir twice, so each slot gets its own
+    directory, guarded by an flock that the OS releases if the worker dies.
+    """
+
+    def __init__(self, master_path=None, slots_path=None, slot_count=None):
+        self.master_path = master_path or os.path.join(os.getcwd(), 'chrome_profile')
+        self.slots_path = slots_path or os.path.join(os.getcwd(), 'chrome_profile_slots')
+        self.slot_count = slot_count or int(os.environ.get('CHROME_PROFILE_SLOTS', '4'))
+
+    def _lock_path(self, name):
+        return os.path.join(self.slots_path, f'{name}.lock')
+
+    def _read_version(self, path):
+        try:
+            with open(os.path.join(path, VERSION_FILE)) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return ''
+
+    def _write_version(self, path, version):
+        with open(os.path.join(path, VERSION_FILE), 'w') as f:
+            f.write(version)
+
+    def _master_version(self):
+        """The master's sync_back version plus the mtime and size of its cookie stores."""
+        parts = [self._read_version(self.master_path) or 'initial']
+        for relative_path in COOKIE_FILES:
+            try:
+                stat = os.stat(os.path.join(self.master_path, relative_path))
+            except FileNotFoundError:
+                continue
+            parts.append(f'{relative_path}:{stat.st_mtime_ns}:{stat.st_size}')
+        return '|'.join(parts)
+
+    def _copy_session_files(self, source, destination):
+        for relative_path in SESSION_FILES:
+            source_path = os.path.join(source, relative_path)
+            destination_path = os.path.join(destination, relative_path)
+            if os.path.isdir(destination_path):
+                shutil.rmtree(destination_path)
+            elif os.path.exists(destination_path):
+                os.remove(destination_path)
+            if not os.path.exists(source_path):
+                continue
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            if os.path.isdir(source_path):
+                shutil.copytree(source_path, destination_path)
+            else:
+                shutil.copy2(source_path, destination_path)
+
+    @contextmanager
+    def _master_lock(self):
+        os.makedirs(self.slots_path, exist_ok=True)
+        with open(self._lock_path('master'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _prepare_slot(self, slot_path):
+        """Refresh a slot's session files if the master has changed since it was cloned."""
+        os.makedirs(slot_path, exist_ok=True)
+        for name in SINGLETON_FILES:
+            singleton_path = os.path.join(slot_path, name)
+            if os.path.lexists(singleton_path):
+                os.remove(singleton_path)
+
+        with self._master_lock():
+            master_version = self._master_version()
+            if os.path.isdir(self.master_path) and self._read_version(slot_path) != master_version:
+                print(f"📋 Cloning session files from master profile into {slot_path}")
+                self._copy_session_files(self.master_path, slot_path)
+                self._write_version(slot_path, master_version)
+
+    @contextmanager
+    def acquire(self, timeout=60):
+        """Reserve a free profile slot and yield its --user-data-dir path."""
+        os.makedirs(self.slots_path, exist_ok=True)
+        deadline = time.time() + timeout
+        while True:
+            for slot in range(self.slot_count):
+                lock_file = open(self._lock_path(f'slot_{slot}'), 'w')
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    lock_file.close()
+                    continue
+
+                slot_path = os.path.join(self.slots_path, f'slot_{slot}')
+                try:
+                    self._prepare_slot(slot_path)
+                    print(f"ℹ️  Acquired Chrome profile slot {slot}")
+                    yield slot_path
+                    return
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+            if time.time() >= deadline:
+                raise SlotsBusyError(f"All {self.slot_count} browser slots are busy. Please try again shortly.")
+            time.sleep(0.5)
+
+    def sync_back(self, slot_path):
+        """Promote a slot's refreshed login session to the master profile."""
+        with self._master_lock():
+            os.makedirs(self.master_path, exist_ok=True)
+            self._copy_session_files(slot_path, self.master_path)
+            self._write_version(self.master_path, str(time.time()))
+            # The source slot is already up to date with the new master
+            self._write_version(slot_path, self._master_version())
+        print("✅ Synced refreshed login session back to the master profile.")
+
+
+profile_manager = ChromeProfileManager()
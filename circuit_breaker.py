@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException
+
+from chrome_profiles import SlotsBusyError
+
+# Failure kinds. Login walls don't heal on their own, so they trip the circuit
+# immediately; layout/timeouts get a few retries first.
+LOGIN_REQUIRED = 'login_required'
+CONTENT_NOT_FOUND = 'content_not_found'
+TIMEOUT = 'timeout'
+ERROR = 'error'
+# Local load (every browser slot busy) says nothing about the remote host's
+# health, so it never counts toward opening the circuit
+CAPACITY = 'capacity'
+
+FAILURE_THRESHOLDS = {
+    LOGIN_REQUIRED: 1,
+    CONTENT_NOT_FOUND: 3,
+    TIMEOUT: 3,
+    ERROR: 5,
+}
+
+FAILURE_MESSAGES = {
+    LOGIN_REQUIRED: 'the site is asking for a login',
+    CONTENT_NOT_FOUND: 'recipe content could not be found (the page layout may have changed)',
+    TIMEOUT: 'the site is timing out',
+    ERROR: 'extractions are failing',
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of launching a browser while a host's circuit is open."""
+
+    def __init__(self, host, kind, retry_after):
+        self.host = host
+        self.kind = kind
+        self.retry_after = retry_after
+        super().__init__(
+            f"Extraction from {host} is paused because {FAILURE_MESSAGES.get(kind, FAILURE_MESSAGES[ERROR])}. "
+            f"Retrying automatically in {retry_after}s."
+        )
+
+
+def classify_failure(exc):
+    """Map an extraction exception onto one of the failure kinds above."""
+    if isinstance(exc, SlotsBusyError):
+        return CAPACITY
+    if isinstance(exc, TimeoutException):
+        return TIMEOUT
+    message = str(exc).lower()
+    if 'login required' in message or 'log in' in message:
+        return LOGIN_REQUIRED
+    if 'could not find' in message or 'could not extract' in message:
+        return CONTENT_NOT_FOUND
+    if 'timed out' in message or 'timeout' in message:
+        return TIMEOUT
+    return ERROR
+
+
+class HostCircuitBreaker:
+    """
+    Closed: calls pass through. Open: calls fail fast until reset_timeout has
+    passed. Half-open: a single probe call is let through; success closes the
+    circuit, failure re-opens it.
+    """
+
+    def __init__(self, host, reset_timeout):
+        self.host = host
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = {}
+        self.last_failure_kind = None
+        self.opened_at = None
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == 'closed':
+                return
+            elapsed = time.time() - self.opened_at
+            if self.state == 'open' and elapsed >= self.reset_timeout:
+                print(f"🩺 Circuit for {self.host} is half-open; sending a probe extraction.")
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return
+            retry_after = max(1, int(self.reset_timeout - elapsed))
+            raise CircuitOpenError(self.host, self.last_failure_kind, retry_after)
+
+    def record_success(self):
+        with self._lock:
+            if self.state != 'closed':
+                print(f"✅ Circuit for {self.host} closed after a successful extraction.")
+            self.state = 'closed'
+            self.failures = {}
+            self.probe_in_flight = False
+
+    def record_failure(self, kind):
+        with self._lock:
+            if kind == CAPACITY:
+                # Hand a half-open probe back without judging the host
+                self.probe_in_flight = False
+                return
+            self.failures[kind] = self.failures.get(kind, 0) + 1
+            self.last_failure_kind = kind
+            self.probe_in_flight = False
+            if self.state == 'half_open' or self.failures[kind] >= FAILURE_THRESHOLDS.get(kind, FAILURE_THRESHOLDS[ERROR]):
+                if self.state != 'open':
+                    print(f"🚫 Circuit for {self.host} opened ({kind}); failing fast for {self.reset_timeout}s.")
+                self.state = 'open'
+                self.opened_at = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'host': self.host,
+                'state': self.state,
+                'failures': dict(self.failures),
+                'last_failure_kind': self.last_failure_kind,
+            }
+
+
+class CircuitBreakerRegistry:
+    """One breaker per extraction host, shared by every request in this worker."""
+
+    def __init__(self, reset_timeout=None):
+        self.reset_timeout = reset_timeout or int(os.environ.get('EXTRACT_CIRCUIT_RESET', '300'))
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        host = urlparse(url).netloc.lower() or url
+        if host.startswith('www.'):
+            host = host[4:]
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = HostCircuitBreaker(host, self.reset_timeout)
+            return self._breakers[host]
+
+    def snapshot(self):
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+
+circuit_breakers = CircuitBreakerRegistry()
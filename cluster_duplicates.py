@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Find clusters of near-duplicate recipes already in the library (reposts, a
+reel and a post of the same dish, an NYT recipe and its Instagram copy).
+
+Every recipe's title words and canonical ingredient names are MinHashed into
+the same LSH index the app uses on /save. Bucket-sharing pairs at or above
+the similarity threshold are joined into clusters with union-find. Nothing
+is modified; review the clusters and merge or delete by hand.
+
+Usage:
+    python cluster_duplicates.py [--threshold 0.6] [--json PATH]
+"""
+import argparse
+import json
+import time
+
+
+def find_clusters(pairs):
+    """Union-find over (a, b) pairs; returns lists of keys with two or more members."""
+    parent = {}
+
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key_a, key_b in pairs:
+        root_a, root_b = find(key_a), find(key_b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters = {}
+    for key in parent:
+        clusters.setdefault(find(key), []).append(key)
+    return [sorted(members) for members in clusters.values() if len(members) > 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threshold', type=float, default=None, help='minimum estimated Jaccard similarity')
+    parser.add_argument('--json', help='also write the clusters to this file')
+    args = parser.parse_args()
+
+    from app import app, db, Recipe, duplicate_index, index_recipes_for_ingredients
+    from near_duplicates import DEFAULT_THRESHOLD
+    threshold = args.threshold if args.threshold is not None else DEFAULT_THRESHOLD
+
+    start_time = time.time()
+    with app.app_context():
+        index_recipes_for_ingredients(db.session.query(Recipe.id, Recipe.title))
+        indexed = len(duplicate_index.keys())
+        print(f"🔎 Indexed {indexed} recipes in {time.time() - start_time:.1f}s")
+
+        scores = {}
+        for key_a, key_b, score in duplicate_index.similar_pairs(threshold):
+            scores[(key_a, key_b)] = score
+        clusters = find_clusters(scores)
+
+        titles = dict(db.session.query(Recipe.id, Recipe.title).filter(
+            Recipe.id.in_([key for cluster in clusters for key in cluster])))
+
+    clusters.sort(key=len, reverse=True)
+    results = []
+    for members in clusters:
+        pair_scores = [score for (a, b), score in scores.items() if a in members and b in members]
+        results.append({
+            'recipes': [{'id': recipe_id, 'title': titles.get(recipe_id)} for recipe_id in members],
+            'max_similarity': round(max(pair_scores), 2),
+        })
+        print(f"\n👯 {len(members)} recipes (similarity up to {max(pair_scores):.2f}):")
+        for recipe_id in members:
+            print(f"   {recipe_id:>6}  {titles.get(recipe_id)}")
+
+    print(f"\n✅ {len(clusters)} clusters covering {sum(len(c) for c in clusters)} of {indexed} recipes "
+          f"in {time.time() - start_time:.1f}s.")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'threshold': threshold, 'clusters': results}, f, indent=2)
+        print(f"💾 Clusters written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
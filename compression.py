@@ -0,0 +1,66 @@
+import gzip
+import zlib
+
+import brotli
+
+# Responses smaller than this aren't worth the CPU to compress
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'application/javascript',
+}
+
+# Dynamic responses use cheaper settings than pages compressed once and cached
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+
+def choose_encoding(accept_encoding):
+    """Pick the best content-coding we can serve from an Accept-Encoding header."""
+    offered = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            offered[coding.lower()] = quality
+    for coding in ('br', 'gzip'):
+        if offered.get(coding, offered.get('*', 0)) > 0:
+            return coding
+    return 'identity'
+
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL)
+    return data
+
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of byte chunks incrementally, flushing after each chunk."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    elif encoding == 'gzip':
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+    else:
+        yield from chunks
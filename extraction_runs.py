@@ -0,0 +1,167 @@
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from recipe_extractor import extract_recipe_data
+
+# How long a finished run stays attachable, so a client that reconnects
+# (or retries right after completion) gets the result instead of a new browser
+FINISHED_RUN_TTL = 60
+
+# Lock and result files shared by every gunicorn worker, keyed on a hash of the URL
+RUN_LOCKS_DIR = os.environ.get('EXTRACTION_LOCKS_DIR') or os.path.join(os.getcwd(), 'instance', 'extraction_runs')
+
+
+class ExtractionRun:
+    """One in-flight extraction whose progress events can be followed by any number of clients."""
+
+    def __init__(self, url):
+        self.url = url
+        self.events = []
+        self.result = None
+        # The exception raised by the extractor, re-raised for callers of wait()
+        self.error = None
+        self.done = False
+        self.finished_at = None
+        self._condition = threading.Condition()
+
+    def publish(self, phase, message, **data):
+        with self._condition:
+            self.events.append({'phase': phase, 'message': message, **data})
+            self._condition.notify_all()
+
+    def finish(self, result=None, error=None):
+        with self._condition:
+            self.result = result
+            self.error = error
+            self.done = True
+            self.finished_at = time.time()
+            self._condition.notify_all()
+
+    def follow(self, heartbeat=15):
+        """
+        Yield ('progress', event) for every event so far and as they arrive,
+        then one final ('result', data) or ('error', exception). Yields
+        ('heartbeat', None) while idle so proxies keep the stream open.
+        """
+        index = 0
+        while True:
+            with self._condition:
+                if index >= len(self.events) and not self.done:
+                    self._condition.wait(timeout=heartbeat)
+                new_events = self.events[index:]
+                index += len(new_events)
+                done = self.done
+            for event in new_events:
+                yield 'progress', event
+            if done and index >= len(self.events):
+                if self.error:
+                    yield 'error', self.error
+                else:
+                    yield 'result', self.result
+                return
+            if not new_events:
+                yield 'heartbeat', None
+
+    def wait(self):
+        with self._condition:
+            while not self.done:
+                self._condition.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class ExtractionRunRegistry:
+    """
+    Deduplicate extractions: concurrent requests for the same URL share one
+    browser run. Within a worker they attach to the same ExtractionRun; across
+    workers an flock keyed on the URL makes the second worker wait for the
+    first and reuse the result it leaves behind for FINISHED_RUN_TTL seconds.
+    """
+
+    def __init__(self, locks_dir=None):
+        self.locks_dir = locks_dir or RUN_LOCKS_DIR
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.locks_dir, f'{key}.lock'), os.path.join(self.locks_dir, f'{key}.json')
+
+    def _read_shared_result(self, result_path):
+        """The result another worker finished within FINISHED_RUN_TTL, or None."""
+        try:
+            if time.time() - os.path.getmtime(result_path) > FINISHED_RUN_TTL:
+                return None
+            with open(result_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_shared_result(self, result_path, result):
+        # Write to a temp file and rename so other workers never read a partial result
+        fd, tmp_path = tempfile.mkstemp(dir=self.locks_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, result_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Could not share extraction result with other workers: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _prune(self):
+        now = time.time()
+        for url, run in list(self._runs.items()):
+            if run.done and now - run.finished_at > FINISHED_RUN_TTL:
+                del self._runs[url]
+
+    def start_or_attach(self, url, manual_login=False):
+        """Return the run for this URL, starting a new extraction thread only if none is active."""
+        with self._lock:
+            self._prune()
+            run = self._runs.get(url)
+            # Failed runs aren't reused; retrying should actually retry
+            if run and not (run.done and run.error):
+                print(f"🔗 Attaching to in-flight extraction for {url}")
+                return run
+            run = ExtractionRun(url)
+            self._runs[url] = run
+
+        thread = threading.Thread(target=self._execute, args=(run, manual_login), daemon=True)
+        thread.start()
+        return run
+
+    def _execute(self, run, manual_login):
+        try:
+            os.makedirs(self.locks_dir, exist_ok=True)
+            lock_path, result_path = self._paths(run.url)
+            with open(lock_path, 'w') as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    print(f"🔗 Waiting for another worker's extraction of {run.url}")
+                    run.publish('waiting', 'Waiting for an extraction already running for this URL')
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # A manual login is meant to refresh the session, so it always runs
+                    result = None if manual_login else self._read_shared_result(result_path)
+                    if result is not None:
+                        print(f"♻️  Reusing another worker's extraction of {run.url}")
+                    else:
+                        result = extract_recipe_data(run.url, manual_login=manual_login, progress=run.publish)
+                        self._write_shared_result(result_path, result)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            run.finish(result=result)
+        except Exception as e:
+            print(f"Error extracting recipe: {e}")
+            run.finish(error=e)
+
+
+extraction_runs = ExtractionRunRegistry()
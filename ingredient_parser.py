@@ -0,0 +1,194 @@
+import re
+
+from autocomplete import normalize
+
+VULGAR_FRACTIONS = {
+    '½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4', '⅕': '1/5', '⅖': '2/5',
+    '⅗': '3/5', '⅘': '4/5', '⅙': '1/6', '⅚': '5/6', '⅐': '1/7', '⅛': '1/8', '⅜': '3/8',
+    '⅝': '5/8', '⅞': '7/8', '⅑': '1/9', '⅒': '1/10',
+}
+
+# Canonical unit -> spellings seen in recipes. Single letters are matched
+# case-sensitively further down, since 'T' is a tablespoon and 't' a teaspoon.
+UNIT_ALIASES = {
+    'tsp': ['tsp', 'tsps', 'tsp.', 'teaspoon', 'teaspoons', 't'],
+    'tbsp': ['tbsp', 'tbsps', 'tbsp.', 'tbs', 'tbl', 'tablespoon', 'tablespoons', 'T'],
+    'cup': ['cup', 'cups', 'c'],
+    'fl oz': ['fl oz', 'fl. oz', 'fl. oz.', 'fluid ounce', 'fluid ounces'],
+    'pint': ['pint', 'pints', 'pt'],
+    'quart': ['quart', 'quarts', 'qt'],
+    'gallon': ['gallon', 'gallons', 'gal'],
+    'ml': ['ml', 'mls', 'milliliter', 'milliliters', 'millilitre', 'millilitres'],
+    'l': ['l', 'liter', 'liters', 'litre', 'litres'],
+    'oz': ['oz', 'oz.', 'ounce', 'ounces'],
+    'lb': ['lb', 'lbs', 'lb.', 'lbs.', 'pound', 'pounds'],
+    'mg': ['mg', 'milligram', 'milligrams'],
+    'g': ['g', 'gr', 'gram', 'grams', 'gramme', 'grammes'],
+    'kg': ['kg', 'kgs', 'kilo', 'kilos', 'kilogram', 'kilograms'],
+    'pinch': ['pinch', 'pinches'],
+    'dash': ['dash', 'dashes'],
+    'clove': ['clove', 'cloves'],
+    'can': ['can', 'cans', 'tin', 'tins'],
+    'package': ['package', 'packages', 'pkg', 'packet', 'packets'],
+    'stick': ['stick', 'sticks'],
+    'slice': ['slice', 'slices'],
+    'bunch': ['bunch', 'bunches'],
+    'sprig': ['sprig', 'sprigs'],
+    'handful': ['handful', 'handfuls'],
+    'piece': ['piece', 'pieces'],
+    'leaf': ['leaf', 'leaves'],
+}
+
+UNITS = {alias.lower(): unit for unit, aliases in UNIT_ALIASES.items()
+         for alias in aliases if len(alias) > 1}
+SINGLE_LETTER_UNITS = {alias: unit for unit, aliases in UNIT_ALIASES.items()
+                       for alias in aliases if len(alias) == 1}
+
+# Words that describe preparation or size rather than the ingredient itself
+DESCRIPTORS = {
+    'fresh', 'freshly', 'large', 'medium', 'small', 'extra', 'chopped', 'finely', 'roughly',
+    'coarsely', 'thinly', 'minced', 'diced', 'sliced', 'grated', 'shredded', 'peeled',
+    'crushed', 'packed', 'heaping', 'level', 'softened', 'melted', 'divided', 'optional',
+    'about', 'approximately', 'plus', 'more', 'whole', 'halved', 'quartered', 'cubed',
+    'trimmed', 'rinsed', 'drained', 'room', 'temperature', 'cold', 'warm', 'hot',
+}
+# Trailing phrases that only say how much to use or when
+TRAILING_PHRASES = re.compile(r'\b(?:to taste|for serving|for garnish|to serve|as needed|if needed)\b.*$')
+# Plural endings that aren't plurals, and words that only look plural
+SINGULAR_ENDINGS = ('ss', 'us', 'is', 'ous')
+UNCOUNTABLE = {'molasses', 'grits', 'swiss', 'brussels', 'series'}
+# recipe_ingredient.name is a VARCHAR(200); a narrative line mistaken for an
+# ingredient can be longer than any real name
+MAX_NAME_LENGTH = 200
+
+# Mixed numbers may be written '1 1/2' or '1-1/2'
+NUMBER = r'(?:\d+(?:\s+|-)\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)'
+QUANTITY = re.compile(
+    rf'^(?P<low>{NUMBER})(?:\s*(?:-|–|—|to|or)\s*(?P<high>{NUMBER}))?(?=[^\d/.]|$)\s*', re.IGNORECASE)
+ARTICLE = re.compile(r'^(?:a|an|one)\s+', re.IGNORECASE)
+BULLET = re.compile(r'^(?:[-•*·▪◦–]+|\d+[.)])\s+')
+PARENTHETICAL = re.compile(r'\(([^)]*)\)')
+
+
+def parse_number(text):
+    """'1 1/2' -> 1.5, '1-1/2' -> 1.5, '3/4' -> 0.75, '2.5' -> 2.5."""
+    total = 0.0
+    for part in text.replace('-', ' ').split():
+        if '/' in part:
+            numerator, denominator = part.split('/')
+            total += int(numerator) / int(denominator) if int(denominator) else 0.0
+        else:
+            total += float(part)
+    return total
+
+
+def normalize_fractions(text):
+    """Turn unicode vulgar fractions into ASCII ones, so '1½' reads as '1 1/2'."""
+    text = text.replace('⁄', '/')
+    for char, fraction in VULGAR_FRACTIONS.items():
+        text = re.sub(rf'(\d)?{char}', lambda m: f"{m.group(1)} {fraction}" if m.group(1) else fraction, text)
+    return text
+
+
+def match_unit(text):
+    """Return (canonical unit, rest of text) for a leading unit, or (None, text)."""
+    words = text.split(None, 2)
+    for count in (2, 1):
+        if len(words) < count:
+            continue
+        candidate = ' '.join(words[:count])
+        unit = UNITS.get(candidate.lower()) or SINGLE_LETTER_UNITS.get(candidate.rstrip('.'))
+        if unit:
+            return unit, ' '.join(words[count:])
+    return None, text
+
+
+def singularize(word):
+    if word.endswith(SINGULAR_ENDINGS) or word in UNCOUNTABLE or len(word) <= 3:
+        return word
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith('ves') and word not in ('cloves', 'olives', 'chives'):
+        return word[:-3] + 'f'
+    if word.endswith(('oes', 'ches', 'shes', 'xes')):
+        return word[:-2]
+    if word.endswith('s'):
+        return word[:-1]
+    return word
+
+
+def canonical_name(text):
+    """Reduce an ingredient description to a stable key: 'Yellow Onions, diced' -> 'yellow onion'."""
+    text = PARENTHETICAL.sub(' ', text).split(',')[0].lower()
+    text = TRAILING_PHRASES.sub('', text)
+    text = re.sub(r'^(?:of|the)\s+', '', text.strip())
+    words = [word for word in normalize(text).split() if word not in DESCRIPTORS]
+    if not words:
+        return ''
+    words[-1] = singularize(words[-1])
+    name = ' '.join(words)
+    if len(name) > MAX_NAME_LENGTH:
+        name = name[:MAX_NAME_LENGTH + 1].rsplit(' ', 1)[0][:MAX_NAME_LENGTH]
+    return name
+
+
+def split_quantity(line):
+    """
+    Split the leading quantity and unit off an ingredient line. Returns
+    (quantity, quantity_max, unit, rest, size_note); rest is the original
+    wording that follows, e.g. 'all-purpose flour, sifted'.
+    """
+    text = BULLET.sub('', normalize_fractions(line or '').strip()).strip()
+    quantity = quantity_max = unit = size_note = None
+
+    match = QUANTITY.match(text)
+    if match:
+        quantity = parse_number(match.group('low'))
+        if match.group('high'):
+            quantity_max = parse_number(match.group('high'))
+        text = text[match.end():]
+    else:
+        article = ARTICLE.match(text)
+        if article and match_unit(text[article.end():])[0]:
+            quantity = 1.0
+            text = text[article.end():]
+
+    # '1 (14 oz) can tomatoes': the parenthetical sizes the unit, keep it as a note
+    leading_parenthetical = re.match(r'^\(([^)]*)\)\s*', text)
+    if quantity is not None and leading_parenthetical:
+        size_note = leading_parenthetical.group(1)
+        text = text[leading_parenthetical.end():]
+
+    if quantity is not None:
+        # Also picks up units written against the number ('200g'), which QUANTITY leaves as 'g ...'
+        unit, rest = match_unit(text)
+        if unit:
+            text = re.sub(r'^of\s+', '', rest.strip(), flags=re.IGNORECASE)
+    return quantity, quantity_max, unit, text, size_note
+
+
+def parse_ingredient(line):
+    """
+    Split an ingredient line into quantity, unit and canonical name. Handles
+    fractions, mixed numbers, unicode vulgar fractions and ranges ('2-3',
+    '1 to 2'); a range is returned as quantity..quantity_max.
+
+        '1½ cups all-purpose flour, sifted'
+            -> {'quantity': 1.5, 'quantity_max': None, 'unit': 'cup',
+                'name': 'all purpose flour', 'note': 'sifted'}
+
+    Section headings ('For the sauce:') come back with an empty name.
+    """
+    parsed = {'quantity': None, 'quantity_max': None, 'unit': None, 'name': '', 'note': None}
+    if not (line or '').strip() or line.strip().endswith(':'):
+        return parsed
+
+    quantity, quantity_max, unit, text, size_note = split_quantity(line)
+    parsed.update(quantity=quantity, quantity_max=quantity_max, unit=unit)
+    notes = [size_note] + PARENTHETICAL.findall(text)
+    if ',' in text:
+        notes.append(PARENTHETICAL.sub('', text.split(',', 1)[1]).strip())
+    parsed['name'] = canonical_name(text)
+    notes = [note for note in notes if note]
+    parsed['note'] = '; '.join(notes) if notes else None
+    return parsed
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Load-test the Flask routes over real HTTP.
+
+Seeds a synthetic library (recipes, tags, cook counts, raw text) into a
+throwaway database, starts gunicorn the same way the Dockerfile does with
+browser extraction stubbed out, then drives a weighted mix of requests at
+each concurrency level and reports p50/p95/p99 latency and requests per
+second per route. GET /recipes cycles through every sort/search/tag
+combination and is also broken down by sort order.
+
+Without --database-url a temporary SQLite file is used and deleted
+afterwards. A --database-url must point at a database that can be thrown
+away: the harness refuses to run against one that already holds recipes,
+and drops its tables when it finishes unless --keep-db is given.
+
+Usage:
+    python load_test.py [--recipes N] [--concurrency 1,4,16] [--duration SECONDS]
+                        [--workers N] [--threads N] [--database-url URL] [--json PATH]
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+SORT_ORDERS = ['newest', 'oldest', 'title_asc', 'title_desc', 'most_cooked', 'least_cooked', 'recently_cooked']
+TAG_NAMES = ['dinner', 'quick-eats', 'baking', 'vegetarian', 'vegan', 'dessert', 'breakfast', 'soup',
+             'salad', 'pasta', 'chicken', 'seafood', 'meal-prep', 'dinner-party', 'spicy', 'weeknight']
+TITLE_WORDS = ['roasted', 'crispy', 'creamy', 'spicy', 'lemon', 'garlic', 'honey', 'smoky', 'herbed', 'braised',
+               'chicken', 'salmon', 'tofu', 'mushroom', 'lentil', 'chickpea', 'pork', 'beef', 'shrimp', 'squash',
+               'tacos', 'curry', 'stew', 'salad', 'pasta', 'risotto', 'noodles', 'soup', 'bowl', 'traybake']
+INGREDIENTS = ['olive oil', 'garlic cloves, minced', 'yellow onion, diced', 'kosher salt', 'black pepper',
+               'lemon juice', 'unsalted butter', 'all-purpose flour', 'chicken stock', 'heavy cream',
+               'fresh parsley', 'ground cumin', 'smoked paprika', 'soy sauce', 'brown sugar', 'canned tomatoes',
+               'parmesan, grated', 'fresh ginger', 'coconut milk', 'red pepper flakes']
+QUANTITIES = ['1', '2', '1/2', '1 1/2', '3', '1/4', '200 g', '1 cup', '2 tbsp', '1 tsp']
+# The first entry (no search) is the common case; the others hit title and ingredient text
+SEARCH_TERMS = ['', 'chicken', 'garlic', 'zzz-no-match']
+TAG_FILTERS = ['', 'All', 'dinner', 'vegan']
+
+# Relative frequency of each route in the request mix
+ROUTE_WEIGHTS = {
+    'GET /recipes': 40,
+    'GET /recipe/<id>': 35,
+    'GET /tags': 10,
+    'POST /mark_cooked/<id>': 10,
+    'POST /save': 5,
+}
+
+
+def stub_extract_recipe_data(url, manual_login=False, progress=None):
+    """Stand-in for recipe_extractor.extract_recipe_data that never starts a browser."""
+    if progress:
+        progress('parsing_done', 'Stubbed extraction')
+    return {'title': 'Stubbed Recipe', 'ingredients': ['1 cup flour'], 'steps': ['Mix.'],
+            'raw_text': '', 'source_url': url, 'snapshot_hash': None}
+
+
+def stubbed_app():
+    """Gunicorn entry point: the production app with browser extraction replaced by a canned result."""
+    import extraction_runs
+    extraction_runs.extract_recipe_data = stub_extract_recipe_data
+    from app import app
+    return app
+
+
+def synthetic_recipe(rng, index):
+    title = ' '.join(rng.sample(TITLE_WORDS, 3)).title()
+    ingredients = [f"{rng.choice(QUANTITIES)} {ingredient}"
+                   for ingredient in rng.sample(INGREDIENTS, rng.randint(5, 14))]
+    steps = [f"Step {n + 1}: {' '.join(rng.choices(TITLE_WORDS, k=rng.randint(8, 20)))}."
+             for n in range(rng.randint(3, 9))]
+    return {
+        'title': f'{title} #{index}',
+        'description': f'A synthetic load-test recipe ({index}).',
+        'ingredients': ingredients,
+        'steps': steps,
+        'servings': str(rng.randint(1, 8)),
+        'raw_text': '\n'.join([title] + ingredients + steps),
+        'tags': rng.sample(TAG_NAMES, rng.randint(0, 4)),
+    }
+
+
+def seed_database(database_url, recipe_count, seed):
+    """Create the schema and insert recipe_count synthetic recipes. Returns the recipe ids."""
+    os.environ['DATABASE_URL'] = database_url
+    from app import app, db, Recipe, Tag, parse_ingredient_rows
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    with app.app_context():
+        db.create_all()
+        if db.session.query(Recipe.id).first() is not None:
+            sys.exit(f"❌ {database_url} already contains recipes; point --database-url at a throwaway database.")
+
+        tags = {name: Tag(name=name) for name in TAG_NAMES}
+        db.session.add_all(tags.values())
+        for start in range(0, recipe_count, 500):
+            for index in range(start, min(start + 500, recipe_count)):
+                data = synthetic_recipe(rng, index)
+                cook_count = rng.choice([0, 0, 0, 1, 2, 3, 5, 8, 13])
+                created_at = now - timedelta(days=rng.uniform(0, 730))
+                recipe = Recipe(
+                    title=data['title'],
+                    description=data['description'],
+                    ingredients=data['ingredients'],
+                    steps=data['steps'],
+                    servings=data['servings'],
+                    raw_text=data['raw_text'],
+                    cook_count=cook_count,
+                    last_cooked_date=created_at + timedelta(days=rng.uniform(0, 30)) if cook_count else None,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+                recipe.tags = [tags[name] for name in data['tags']]
+                recipe.parsed_ingredients = parse_ingredient_rows(recipe.ingredients)
+                db.session.add(recipe)
+            db.session.commit()
+        ids = [row.id for row in db.session.query(Recipe.id)]
+        db.session.remove()
+    return ids
+
+
+def drop_database(database_url):
+    os.environ['DATABASE_URL'] = database_url
+    from app import app, db
+    with app.app_context():
+        db.drop_all()
+
+
+def start_server(database_url, port, workers, threads):
+    env = dict(os.environ, DATABASE_URL=database_url, FLASK_ENV='production')
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+               '--threads', str(threads), '--timeout', '120', '--log-level', 'warning', 'load_test:stubbed_app()']
+    server = subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"❌ gunicorn exited with status {server.returncode}")
+        try:
+            # Gunicorn accepts connections before its workers have imported the app
+            if requests.get(f'{base_url}/tags', timeout=5).ok:
+                return server, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.terminate()
+    sys.exit("❌ gunicorn did not become ready within 30s")
+
+
+class RequestMix:
+    """Weighted random requests; /recipes walks every sort/search/tag combination in turn."""
+
+    def __init__(self, recipe_ids, seed):
+        self.recipe_ids = recipe_ids
+        self.rng = random.Random(seed)
+        self.routes = list(ROUTE_WEIGHTS)
+        self.weights = list(ROUTE_WEIGHTS.values())
+        self.listing_params = itertools.cycle(itertools.product(SORT_ORDERS, SEARCH_TERMS, TAG_FILTERS))
+        self.saved = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        """Return (route, detail, method, path, json_body)."""
+        with self._lock:
+            route = self.rng.choices(self.routes, self.weights)[0]
+            if route == 'GET /recipes':
+                sort, search, tag = next(self.listing_params)
+                params = '&'.join(f'{k}={v}' for k, v in [('sort', sort), ('search', search), ('tag', tag)] if v)
+                return route, f'sort={sort}', 'GET', f'/recipes?{params}', None
+            if route == 'GET /recipe/<id>':
+                return route, None, 'GET', f'/recipe/{self.rng.choice(self.recipe_ids)}', None
+            if route == 'GET /tags':
+                return route, None, 'GET', '/tags', None
+            if route == 'POST /mark_cooked/<id>':
+                return route, None, 'POST', f'/mark_cooked/{self.rng.choice(self.recipe_ids)}', None
+            self.saved += 1
+            recipe = synthetic_recipe(self.rng, f'load-{self.saved}')
+            return route, None, 'POST', '/save', {'recipe': recipe}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+def run_level(base_url, mix, concurrency, duration):
+    """Drive the mix with `concurrency` client threads for `duration` seconds."""
+    samples = []
+    errors = []
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def client():
+        session = requests.Session()
+        local_samples = []
+        local_errors = []
+        while time.time() < stop_at:
+            route, detail, method, path, body = mix.next()
+            started = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path, json=body, timeout=120)
+                response.content  # include body transfer in the timing
+                ok = response.status_code < 400
+            except requests.RequestException as e:
+                ok = False
+                local_errors.append(f'{route}: {e}')
+            elapsed = time.perf_counter() - started
+            local_samples.append((route, detail, elapsed, ok))
+        with lock:
+            samples.extend(local_samples)
+            errors.extend(local_errors)
+
+    started = time.time()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_time = time.time() - started
+    return summarize(samples, wall_time, concurrency), errors
+
+
+def summarize_group(latencies, failures, wall_time):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': failures,
+        'rps': round(len(latencies) / wall_time, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def summarize(samples, wall_time, concurrency):
+    groups = {}
+    for route, detail, elapsed, ok in samples:
+        keys = [route] + ([f'{route} {detail}'] if detail else [])
+        for key in keys:
+            latencies, failures = groups.setdefault(key, ([], [0]))
+            latencies.append(elapsed)
+            if not ok:
+                failures[0] += 1
+    overall = summarize_group([elapsed for _, _, elapsed, _ in samples],
+                              sum(1 for *_, ok in samples if not ok), wall_time)
+    return {
+        'concurrency': concurrency,
+        'seconds': round(wall_time, 1),
+        'overall': overall,
+        'routes': {key: summarize_group(latencies, failures[0], wall_time)
+                   for key, (latencies, failures) in sorted(groups.items())},
+    }
+
+
+def print_report(result):
+    overall = result['overall']
+    print(f"\n📊 Concurrency {result['concurrency']}: {overall['requests']} requests in {result['seconds']}s, "
+          f"{overall['rps']} req/s, {overall['errors']} errors, "
+          f"p50 {overall['p50_ms']} / p95 {overall['p95_ms']} / p99 {overall['p99_ms']} ms")
+    print(f"   {'route':<40} {'count':>7} {'req/s':>8} {'errors':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for key, stats in result['routes'].items():
+        label = key if ' sort=' not in key else '  ' + key.split(' ', 2)[2]
+        print(f"   {label:<40} {stats['requests']:>7} {stats['rps']:>8} {stats['errors']:>7} "
+              f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recipes', type=int, default=2000, help='size of the synthetic library')
+    parser.add_argument('--concurrency', default='1,4,16', help='comma-separated client concurrency levels')
+    parser.add_argument('--duration', type=float, default=20, help='seconds to run each concurrency level')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (production uses 2)')
+    parser.add_argument('--threads', type=int, default=1, help='gunicorn threads per worker (production uses 1)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--database-url', help='throwaway database to seed (default: temporary SQLite file)')
+    parser.add_argument('--keep-db', action='store_true', help='leave the seeded database in place afterwards')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the library and request mix')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    temp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        temp_dir = tempfile.mkdtemp(prefix='recipe-load-test-')
+        database_url = f"sqlite:///{os.path.join(temp_dir, 'recipes.db')}"
+
+    print(f"🌱 Seeding {args.recipes} recipes into {database_url} ...")
+    started = time.time()
+    recipe_ids = seed_database(database_url, args.recipes, args.seed)
+    print(f"   done in {time.time() - started:.1f}s")
+
+    server, base_url = start_server(database_url, args.port, args.workers, args.threads)
+    results = []
+    try:
+        mix = RequestMix(recipe_ids, args.seed)
+        # Warm up every route so first-request costs (lazy indexes, page cache) aren't measured
+        for route, _, method, path, body in (mix.next() for _ in range(50)):
+            requests.request(method, base_url + path, json=body, timeout=120)
+        for concurrency in [int(level) for level in args.concurrency.split(',')]:
+            result, errors = run_level(base_url, mix, concurrency, args.duration)
+            results.append(result)
+            print_report(result)
+            for error in errors[:5]:
+                print(f"   ⚠️  {error}")
+    finally:
+        server.terminate()
+        server.wait()
+        if not args.keep_db:
+            drop_database(database_url)
+        if temp_dir and not args.keep_db:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'recipes': args.recipes, 'workers': args.workers, 'threads': args.threads,
+                       'duration': args.duration, 'results': results}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+import time
+
+# Cookies that only exist while a user is signed in
+INSTAGRAM_SESSION_COOKIES = ['sessionid']
+NYTIMES_SESSION_COOKIES = ['NYT-S', 'SIDNY']
+
+
+class LoginStateCache:
+    """
+    Remember when each site's login was last verified by a full navigation
+    probe, so the probe only runs once per TTL instead of on every extraction.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else int(os.environ.get('LOGIN_CACHE_TTL', '1800'))
+        self._verified_at = {}
+        self._lock = threading.Lock()
+
+    def is_fresh(self, site):
+        with self._lock:
+            verified_at = self._verified_at.get(site)
+        return verified_at is not None and time.time() - verified_at < self.ttl
+
+    def mark_verified(self, site):
+        with self._lock:
+            self._verified_at[site] = time.time()
+
+    def invalidate(self, site):
+        with self._lock:
+            self._verified_at.pop(site, None)
+
+
+def has_session_cookie(driver, domain, cookie_names):
+    """Check the browser profile's cookie jar for an unexpired session cookie, without navigating."""
+    try:
+        cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+    except Exception as e:
+        print(f"⚠️  Could not read profile cookies: {e}")
+        # Can't tell from cookies; let the navigation probe decide
+        return True
+
+    now = time.time()
+    for cookie in cookies:
+        if cookie.get('name') not in cookie_names:
+            continue
+        if not cookie.get('domain', '').lstrip('.').endswith(domain):
+            continue
+        expires = cookie.get('expires', -1)
+        if cookie.get('session') or expires <= 0 or expires > now:
+            return True
+    return False
+
+
+def export_cookies(driver, domain, path):
+    """
+    Write the browser's cookies for a domain to a JSON file. Chrome encrypts its
+    own cookie database, so this is how plain HTTP clients borrow the login.
+    """
+    cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+    cookies = [cookie for cookie in cookies if cookie.get('domain', '').lstrip('.').endswith(domain)]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(cookies, f)
+    os.replace(tmp_path, path)
+    return len(cookies)
+
+
+def load_cookies(session, path):
+    """Load unexpired cookies written by export_cookies into a requests session. Returns how many were loaded."""
+    try:
+        with open(path) as f:
+            cookies = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+    now = time.time()
+    loaded = 0
+    for cookie in cookies:
+        expires = cookie.get('expires', -1)
+        if not cookie.get('session') and 0 < expires <= now:
+            continue
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'],
+                            path=cookie.get('path', '/'), secure=cookie.get('secure', False))
+        loaded += 1
+    return loaded
+
+
+login_cache = LoginStateCache()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Bring the database up to the current schema: create any missing tables, then
+run every migrate_*.py step in the order the schema changed. Each step checks
+what's already done, so this is safe to run on every start (start_production.sh
+and the Docker image do) and does nothing on an up-to-date database.
+
+Usage:
+    python migrate_all.py
+"""
+from app import app, db
+
+import migrate_change_feed
+import migrate_json_columns
+import migrate_raw_text
+import migrate_recipe_ingredients
+import migrate_snapshot_columns
+
+
+def main():
+    with app.app_context():
+        print("🔧 Creating missing tables...")
+        db.create_all()
+
+    migrate_json_columns.main()
+    migrate_raw_text.main()
+    migrate_snapshot_columns.main()
+    migrate_change_feed.main()
+    migrate_recipe_ingredients.backfill(missing_only=True)
+    print("✅ Database is up to date.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Add the updated_at index and recipe_deletion log used by /recipes/changes.
+
+Usage:
+    python migrate_change_feed.py
+"""
+from app import app, db, RecipeDeletion
+from sqlalchemy import text
+
+
+def main():
+    with app.app_context():
+        print("▶️  Creating index on recipe.updated_at...")
+        with db.engine.begin() as conn:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_recipe_updated_at ON recipe (updated_at)"))
+        print("▶️  Creating recipe_deletion table...")
+        RecipeDeletion.__table__.create(db.engine, checkfirst=True)
+        print("✅ Migration complete.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Migrate Recipe.ingredients and Recipe.steps from JSON strings in TEXT columns
+to native JSON storage (JSONB on PostgreSQL, JSON1-validated text on SQLite).
+
+Usage:
+    python migrate_json_columns.py
+"""
+from app import app, db
+from sqlalchemy import text
+
+JSON_COLUMNS = ['ingredients', 'steps']
+
+
+def migrate_postgresql(conn):
+    for column in JSON_COLUMNS:
+        data_type = conn.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'recipe' AND column_name = :column"
+        ), {'column': column}).scalar()
+        if data_type == 'jsonb':
+            print(f"✅ recipe.{column} is already JSONB, skipping.")
+            continue
+        print(f"▶️  Converting recipe.{column} ({data_type}) to JSONB...")
+        conn.execute(text(
+            f"ALTER TABLE recipe ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"
+        ))
+        print(f"✅ recipe.{column} converted.")
+
+
+def migrate_sqlite(conn):
+    # SQLite stores JSON as text, so existing rows keep working; validate them
+    # with JSON1 and rewrite them in minified form.
+    for column in JSON_COLUMNS:
+        invalid_ids = [row[0] for row in conn.execute(text(
+            f"SELECT id FROM recipe WHERE NOT json_valid({column})"
+        ))]
+        if invalid_ids:
+            print(f"⚠️  recipe.{column} has invalid JSON in recipes {invalid_ids}; wrapping as single-item lists.")
+            conn.execute(text(
+                f"UPDATE recipe SET {column} = json_array({column}) WHERE NOT json_valid({column})"
+            ))
+        result = conn.execute(text(f"UPDATE recipe SET {column} = json({column}) WHERE {column} != json({column})"))
+        print(f"✅ recipe.{column}: normalized {result.rowcount} rows.")
+
+
+def main():
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        print(f"🔧 Migrating JSON columns on {dialect}...")
+        with db.engine.begin() as conn:
+            if dialect == 'postgresql':
+                migrate_postgresql(conn)
+            elif dialect == 'sqlite':
+                migrate_sqlite(conn)
+            else:
+                raise Exception(f"Unsupported database dialect: {dialect}")
+        print("✅ Migration complete.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Move Recipe.raw_text out of the recipe table into the zlib-compressed
+recipe_raw_text side table, then drop the old column.
+
+Usage:
+    python migrate_raw_text.py
+"""
+from app import app, db, RecipeRawText, compress_text
+from sqlalchemy import inspect, text
+
+
+def main():
+    with app.app_context():
+        columns = [column['name'] for column in inspect(db.engine).get_columns('recipe')]
+        if 'raw_text' not in columns:
+            print("✅ recipe.raw_text has already been migrated, nothing to do.")
+            return
+
+        print("🔧 Creating recipe_raw_text table...")
+        RecipeRawText.__table__.create(db.engine, checkfirst=True)
+
+        with db.engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, raw_text FROM recipe WHERE raw_text IS NOT NULL AND raw_text != ''"
+            )).fetchall()
+            print(f"▶️  Compressing raw text for {len(rows)} recipes...")
+
+            raw_bytes = 0
+            compressed_bytes = 0
+            for recipe_id, raw_text in rows:
+                data = compress_text(raw_text)
+                raw_bytes += len(raw_text.encode('utf-8'))
+                compressed_bytes += len(data)
+                conn.execute(
+                    RecipeRawText.__table__.delete().where(RecipeRawText.recipe_id == recipe_id)
+                )
+                conn.execute(RecipeRawText.__table__.insert().values(recipe_id=recipe_id, data=data))
+
+            print("▶️  Dropping recipe.raw_text column...")
+            conn.execute(text("ALTER TABLE recipe DROP COLUMN raw_text"))
+
+        if raw_bytes:
+            print(f"✅ Migrated {len(rows)} recipes: {raw_bytes:,} → {compressed_bytes:,} bytes "
+                  f"({compressed_bytes / raw_bytes:.0%} of original).")
+        else:
+            print("✅ Migration complete (no raw text to move).")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Create the recipe_ingredient table and fill it by parsing every recipe's
+ingredient lines with ingredient_parser.parse_ingredient.
+
+Recipes are processed in id order in chunks, one transaction per chunk, and
+each recipe's rows are replaced rather than appended, so the script can be
+re-run safely (e.g. after improving the parser). With --missing-only, only
+recipes that have no rows yet are parsed, which is what migrate_all.py runs
+on every start.
+
+Usage:
+    python migrate_recipe_ingredients.py [--chunk-size N] [--missing-only]
+"""
+import argparse
+import time
+
+from app import app, db, Recipe, RecipeIngredient, parse_ingredient_rows
+
+
+def backfill(chunk_size=500, missing_only=False):
+    with app.app_context():
+        print("🔧 Creating recipe_ingredient table...")
+        RecipeIngredient.__table__.create(db.engine, checkfirst=True)
+
+        table = RecipeIngredient.__table__
+        last_id = 0
+        recipes = 0
+        rows_written = 0
+        start_time = time.time()
+        while True:
+            query = db.session.query(Recipe.id, Recipe.ingredients).filter(Recipe.id > last_id)
+            if missing_only:
+                query = query.filter(~db.session.query(table.c.id).filter(table.c.recipe_id == Recipe.id).exists())
+            chunk = query.order_by(Recipe.id).limit(chunk_size).all()
+            if not chunk:
+                break
+
+            values = []
+            for recipe_id, ingredients in chunk:
+                for row in parse_ingredient_rows(ingredients):
+                    values.append({'recipe_id': recipe_id, 'position': row.position, 'text': row.text,
+                                   'quantity': row.quantity, 'quantity_max': row.quantity_max,
+                                   'unit': row.unit, 'name': row.name, 'note': row.note})
+            db.session.execute(table.delete().where(table.c.recipe_id.in_([recipe_id for recipe_id, _ in chunk])))
+            if values:
+                db.session.execute(table.insert(), values)
+            db.session.commit()
+
+            last_id = chunk[-1].id
+            recipes += len(chunk)
+            rows_written += len(values)
+            print(f"⏱️  {recipes} recipes parsed ({rows_written} ingredient rows), through id {last_id}")
+
+        print(f"✅ Backfilled {rows_written} ingredient rows for {recipes} recipes "
+              f"in {time.time() - start_time:.1f}s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--missing-only', action='store_true', help='only parse recipes without any rows yet')
+    args = parser.parse_args()
+    backfill(args.chunk_size, args.missing_only)
+
+
+if __name__ == '__main__':
+    main()
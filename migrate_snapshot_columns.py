@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Add Recipe.source_url and Recipe.snapshot_hash, which link a recipe to the
+page snapshot it was extracted from (see snapshot_store.py).
+
+Usage:
+    python migrate_snapshot_columns.py
+"""
+from app import app, db
+from sqlalchemy import inspect, text
+
+NEW_COLUMNS = {
+    'source_url': 'VARCHAR(500)',
+    'snapshot_hash': 'VARCHAR(64)',
+}
+
+
+def main():
+    with app.app_context():
+        existing = [column['name'] for column in inspect(db.engine).get_columns('recipe')]
+        with db.engine.begin() as conn:
+            for name, column_type in NEW_COLUMNS.items():
+                if name in existing:
+                    print(f"✅ recipe.{name} already exists, skipping.")
+                    continue
+                print(f"▶️  Adding recipe.{name}...")
+                conn.execute(text(f"ALTER TABLE recipe ADD COLUMN {name} {column_type}"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_recipe_snapshot_hash ON recipe (snapshot_hash)"))
+        print("✅ Migration complete.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import hashlib
+import random
+import threading
+from array import array
+from collections import defaultdict
+
+from autocomplete import normalize
+
+NUM_PERM = 64
+# 16 bands of 4 rows: recipes sharing ~50%+ of their shingles almost always
+# collide in some band, while unrelated recipes rarely do
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.6
+
+MERSENNE_PRIME = (1 << 61) - 1
+# Fixed seed, so signatures agree across workers, runs and the batch job
+_rng = random.Random(20240601)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+TITLE_STOPWORDS = {'a', 'an', 'and', 'the', 'with', 'of', 'in', 'on', 'for', 'my', 'recipe', 'easy',
+                   'best', 'quick', 'simple', 'homemade', 'perfect', 'ever'}
+
+
+def recipe_shingles(title, ingredient_names):
+    """Title words and canonical ingredient names, tagged so 'lemon' the word and 'lemon' the ingredient differ."""
+    shingles = {f't:{word}' for word in normalize(title).split() if word not in TITLE_STOPWORDS}
+    shingles.update(f'i:{name}' for name in ingredient_names if name)
+    return shingles
+
+
+def minhash(shingles):
+    values = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+              for shingle in shingles]
+    return array('Q', [min((a * value + b) % MERSENNE_PRIME for value in values) for a, b in PERMUTATIONS])
+
+
+def similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_PERM
+
+
+def band_keys(signature):
+    return [(band, hash(tuple(signature[band * ROWS:(band + 1) * ROWS]))) for band in range(BANDS)]
+
+
+class MinHashIndex:
+    """
+    In-memory LSH index of MinHash signatures. A lookup only compares against
+    entries sharing at least one band bucket, so finding near-duplicates of a
+    recipe doesn't scan the library.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._buckets = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band_key in band_keys(entry['signature']):
+            keys = self._buckets.get(band_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[band_key]
+
+    def upsert(self, key, shingles, **data):
+        signature = minhash(shingles) if shingles else None
+        with self._lock:
+            self._remove_locked(key)
+            if signature is None:
+                return
+            self._entries[key] = {'signature': signature, 'result': data}
+            for band_key in band_keys(signature):
+                self._buckets[band_key].add(key)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove_locked(key)
+
+    def keys(self):
+        with self._lock:
+            return set(self._entries)
+
+    def query(self, shingles, threshold=DEFAULT_THRESHOLD, exclude=None, limit=10):
+        """Return up to limit (key, similarity, data) for entries at or above threshold, most similar first."""
+        if not shingles:
+            return []
+        signature = minhash(shingles)
+        with self._lock:
+            candidates = set()
+            for band_key in band_keys(signature):
+                candidates |= self._buckets.get(band_key, set())
+            candidates.discard(exclude)
+            matches = []
+            for key in candidates:
+                score = similarity(signature, self._entries[key]['signature'])
+                if score >= threshold:
+                    matches.append((key, score, self._entries[key]['result']))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+    def similar_pairs(self, threshold=DEFAULT_THRESHOLD):
+        """Yield (key_a, key_b, similarity) for every bucket-sharing pair at or above threshold."""
+        with self._lock:
+            buckets = [sorted(keys) for keys in self._buckets.values() if len(keys) > 1]
+            entries = dict(self._entries)
+        seen = set()
+        for keys in buckets:
+            for i, key_a in enumerate(keys):
+                for key_b in keys[i + 1:]:
+                    if (key_a, key_b) in seen:
+                        continue
+                    seen.add((key_a, key_b))
+                    score = similarity(entries[key_a]['signature'], entries[key_b]['signature'])
+                    if score >= threshold:
+                        yield key_a, key_b, score
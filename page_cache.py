@@ -0,0 +1,55 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import brotli
+
+
+class RenderedPage:
+    """One rendered page with its body pre-compressed for each supported encoding."""
+
+    def __init__(self, version, html):
+        data = html.encode('utf-8')
+        self.version = version
+        self.etag = hashlib.sha1(repr(version).encode('utf-8')).hexdigest()
+        self.bodies = {
+            'identity': data,
+            'gzip': gzip.compress(data, compresslevel=6),
+            'br': brotli.compress(data, quality=9, mode=brotli.MODE_TEXT),
+        }
+
+
+class RenderedPageCache:
+    """
+    Per-worker LRU of rendered pages. Entries carry the version they were
+    rendered for and are only served while the caller's current version still
+    matches, so writes in other workers never serve stale HTML.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or int(os.environ.get('RECIPE_PAGE_CACHE_SIZE', '256'))
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None or page.version != version:
+                return None
+            self._pages.move_to_end(key)
+            return page
+
+    def put(self, key, version, html):
+        page = RenderedPage(version, html)
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+        return page
+
+    def invalidate(self, key):
+        with self._lock:
+            self._pages.pop(key, None)
@@ -0,0 +1,83 @@
+import threading
+from collections import defaultdict
+
+
+class IngredientIndex:
+    """
+    In-memory inverted index from canonical ingredient name to recipe ids.
+    A pantry query only touches the posting sets of the names it mentions,
+    so ranking recipes by coverage never scans the whole library.
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._data = {}
+        self._postings = defaultdict(set)
+        # Last word -> names ending in it, so 'flour' can find 'bread flour'
+        # without walking every name in the index
+        self._by_head = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _remove_locked(self, key):
+        self._data.pop(key, None)
+        for name in self._names.pop(key, ()):
+            keys = self._postings.get(name)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._postings[name]
+                head = name.rsplit(' ', 1)[-1]
+                self._by_head[head].discard(name)
+                if not self._by_head[head]:
+                    del self._by_head[head]
+
+    def upsert(self, key, names, **data):
+        names = frozenset(name for name in names if name)
+        with self._lock:
+            self._remove_locked(key)
+            if not names:
+                return
+            self._names[key] = names
+            self._data[key] = data
+            for name in names:
+                self._postings[name].add(key)
+                self._by_head[name.rsplit(' ', 1)[-1]].add(name)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove_locked(key)
+
+    def keys(self):
+        with self._lock:
+            return set(self._names)
+
+    def _expand_locked(self, pantry_name):
+        """Indexed names a pantry item covers: itself, and more specific names ending in it."""
+        suffix = f' {pantry_name}'
+        return {name for name in self._by_head.get(pantry_name.rsplit(' ', 1)[-1], ())
+                if name == pantry_name or name.endswith(suffix)}
+
+    def query(self, pantry_names, min_coverage=0.0, limit=20):
+        """
+        Rank recipes sharing at least one ingredient with the pantry by the
+        fraction of their ingredients it covers, then by fewest missing.
+        Returns up to limit (key, coverage, covered names, missing names, data).
+        """
+        with self._lock:
+            covered_names = set()
+            for pantry_name in pantry_names:
+                if pantry_name:
+                    covered_names |= self._expand_locked(pantry_name)
+            candidates = set()
+            for name in covered_names:
+                candidates |= self._postings[name]
+            matches = []
+            for key in candidates:
+                names = self._names[key]
+                covered = names & covered_names
+                coverage = len(covered) / len(names)
+                if coverage >= min_coverage:
+                    matches.append((key, coverage, sorted(covered), sorted(names - covered), self._data[key]))
+        matches.sort(key=lambda match: (-match[1], len(match[3]), match[0]))
+        return matches[:limit]
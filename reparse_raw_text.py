@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Backfill structured fields by re-parsing stored raw_text with the current
+InstagramRecipeExtractor.parse_recipe_text.
+
+Recipes are streamed in id order in chunks, parsed across a multiprocessing
+pool, diffed against the stored ingredients/steps, and accepted changes are
+written back one transaction per chunk. Progress is checkpointed after each
+chunk, so an interrupted run picks up where it left off.
+
+Modes:
+    fill     only fill ingredients/steps that are currently empty (default)
+    replace  overwrite whenever the new parse differs and is non-empty
+
+Usage:
+    python reparse_raw_text.py [--apply] [--mode fill|replace] [--chunk-size N] [--workers N] [--reset]
+"""
+import argparse
+import json
+import os
+import re
+import time
+from multiprocessing import Pool
+
+FIELDS = ['ingredients', 'steps']
+DEFAULT_CHECKPOINT = os.path.join(os.getcwd(), 'instance', 'reparse_raw_text.checkpoint')
+
+# Recipes saved before source_url existed have it NULL, so NYTimes rows are
+# also recognised by their raw_text, which is the whole page body: a byline,
+# a "Yield" line and bare section headings that captions don't have
+NYTIMES_MARKERS = [
+    re.compile(r'^By [A-Z]', re.MULTILINE),
+    re.compile(r'^Yield\b', re.MULTILINE),
+    re.compile(r'^Ingredients$', re.MULTILINE),
+    re.compile(r'^Preparation$', re.MULTILINE),
+    re.compile(r'NYT Cooking|cooking\.nytimes\.com|Leave a Private Note', re.IGNORECASE),
+]
+
+_extractor = None
+
+
+def looks_like_nytimes_page(text):
+    """True when raw_text is a NYTimes page body rather than a caption."""
+    text = '\n'.join(line.strip() for line in text.splitlines())
+    return sum(1 for marker in NYTIMES_MARKERS if marker.search(text)) >= 2
+
+
+def parse_raw_text(job):
+    """Worker: decompress and parse one recipe's raw text. Returns (recipe_id, parsed_data or None for NYTimes pages)."""
+    global _extractor
+    recipe_id, compressed = job
+    from app import decompress_text
+    if _extractor is None:
+        from recipe_extractor import InstagramRecipeExtractor
+        _extractor = InstagramRecipeExtractor()
+    text = decompress_text(compressed)
+    if looks_like_nytimes_page(text):
+        return recipe_id, None
+    parsed = _extractor.parse_recipe_text(text)
+    return recipe_id, {field: parsed[field] for field in FIELDS}
+
+
+def accepted_changes(stored, parsed, mode):
+    """Return the fields from a new parse that should replace the stored values."""
+    changes = {}
+    for field in FIELDS:
+        new_value = parsed[field]
+        if not new_value or new_value == stored[field]:
+            continue
+        if mode == 'fill' and stored[field]:
+            continue
+        changes[field] = new_value
+    return changes
+
+
+def load_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)['last_id']
+    except FileNotFoundError:
+        return 0
+
+
+def save_checkpoint(path, last_id):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'last_id': last_id}, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--apply', action='store_true', help='write accepted changes (default is a dry run)')
+    parser.add_argument('--mode', choices=['fill', 'replace'], default='fill')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--reset', action='store_true', help='ignore the checkpoint and start from the beginning')
+    args = parser.parse_args()
+
+    from sqlalchemy import or_, update
+    from app import app, db, Recipe, RecipeRawText, forget_recipe_contents, replace_parsed_ingredients
+
+    last_id = 0 if args.reset else load_checkpoint(args.checkpoint)
+    if last_id:
+        print(f"↩️  Resuming after recipe {last_id} (use --reset to start over).")
+
+    processed = 0
+    changed = 0
+    skipped = 0
+    start_time = time.time()
+    with app.app_context(), Pool(processes=args.workers) as pool:
+        while True:
+            # NYTimes raw_text is a whole page body and its structured fields come from
+            # page selectors, so only Instagram captions and manual recipes are re-parsed.
+            # Legacy rows without a source_url are screened by parse_raw_text instead.
+            rows = db.session.query(Recipe.id, Recipe.ingredients, Recipe.steps, RecipeRawText.data) \
+                .join(RecipeRawText, RecipeRawText.recipe_id == Recipe.id) \
+                .filter(Recipe.id > last_id) \
+                .filter(or_(Recipe.source_url.is_(None), ~Recipe.source_url.contains('cooking.nytimes.com'))) \
+                .order_by(Recipe.id) \
+                .limit(args.chunk_size) \
+                .all()
+            if not rows:
+                break
+
+            stored = {row.id: {'ingredients': row.ingredients, 'steps': row.steps} for row in rows}
+            jobs = [(row.id, row.data) for row in rows]
+            updates = []
+            for recipe_id, parsed in pool.imap_unordered(parse_raw_text, jobs, chunksize=16):
+                if parsed is None:
+                    skipped += 1
+                    continue
+                changes = accepted_changes(stored[recipe_id], parsed, args.mode)
+                if changes:
+                    print(f"📝 Recipe {recipe_id}: {', '.join(changes)} "
+                          f"({', '.join(f'{len(stored[recipe_id][f])} → {len(v)} items' for f, v in changes.items())})")
+                    updates.append({'id': recipe_id, **changes})
+
+            if args.apply and updates:
+                db.session.execute(update(Recipe), updates)
+                replace_parsed_ingredients({change['id']: change['ingredients']
+                                            for change in updates if 'ingredients' in change})
+                db.session.commit()
+                for change in updates:
+                    forget_recipe_contents(change['id'])
+            else:
+                db.session.rollback()
+
+            last_id = rows[-1].id
+            # Dry runs never advance the checkpoint, so they can be repeated freely
+            if args.apply:
+                save_checkpoint(args.checkpoint, last_id)
+            processed += len(rows)
+            changed += len(updates)
+            elapsed = time.time() - start_time
+            print(f"⏱️  {processed} recipes processed ({processed / elapsed:.0f}/s), through id {last_id}")
+
+    elapsed = time.time() - start_time
+    rate = processed / elapsed if elapsed else 0
+    print(f"✅ Done: {processed} recipes in {elapsed:.1f}s ({rate:.0f}/s), {changed} "
+          f"{'updated' if args.apply else 'would change'}, {skipped} NYTimes pages skipped.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Re-run the extractor parsers over stored page snapshots, offline.
+
+No browser or network is involved: each recipe's snapshot is read from the
+snapshot store and parsed with BeautifulSoup in a process pool. By default
+this is a dry run that reports what would change; pass --apply to write the
+re-parsed fields back.
+
+Usage:
+    python reparse_snapshots.py [--apply] [--workers N] [--fields ingredients,steps] [--recipe-id ID ...]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from snapshot_store import SnapshotStore
+
+DEFAULT_FIELDS = ['ingredients', 'steps']
+
+
+def reparse_snapshot(job):
+    """Worker: parse one snapshot. Returns (recipe_id, parsed_data, error)."""
+    recipe_id, source_url, snapshot_hash, store_root = job
+    # Imported here so the parent process doesn't need the extractor loaded
+    from recipe_extractor import get_recipe_extractor
+    try:
+        html = SnapshotStore(store_root).get(snapshot_hash)
+        extractor = get_recipe_extractor(source_url)
+        return recipe_id, extractor.parse_snapshot(html), None
+    except Exception as e:
+        return recipe_id, None, str(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--apply', action='store_true', help='write re-parsed fields back to the database')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='parser processes (default: CPU count)')
+    parser.add_argument('--fields', default=','.join(DEFAULT_FIELDS), help='comma-separated fields to update')
+    parser.add_argument('--recipe-id', type=int, action='append', help='only re-parse these recipes')
+    args = parser.parse_args()
+    fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+
+    from app import app, db, Recipe, forget_recipe_contents, parse_ingredient_rows
+    from snapshot_store import snapshot_store
+
+    with app.app_context():
+        query = Recipe.query.filter(Recipe.snapshot_hash.isnot(None), Recipe.source_url.isnot(None))
+        if args.recipe_id:
+            query = query.filter(Recipe.id.in_(args.recipe_id))
+        recipes = {recipe.id: recipe for recipe in query.all()}
+        jobs = [(r.id, r.source_url, r.snapshot_hash, snapshot_store.root) for r in recipes.values()
+                if snapshot_store.exists(r.snapshot_hash)]
+        print(f"🔁 Re-parsing {len(jobs)} snapshots with {args.workers} workers "
+              f"({len(recipes) - len(jobs)} recipes skipped, snapshot missing)...")
+
+        start_time = time.time()
+        changed = 0
+        failed = 0
+        updated_ids = []
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for recipe_id, parsed, error in pool.map(reparse_snapshot, jobs, chunksize=8):
+                recipe = recipes[recipe_id]
+                if error:
+                    failed += 1
+                    print(f"⚠️  Recipe {recipe_id}: {error}")
+                    continue
+
+                updates = {field: parsed[field] for field in fields
+                           if parsed.get(field) and parsed[field] != getattr(recipe, field)}
+                if not updates:
+                    continue
+                changed += 1
+                print(f"📝 Recipe {recipe_id} ({recipe.title}): {', '.join(updates)} changed")
+                if args.apply:
+                    updated_ids.append(recipe_id)
+                    for field, value in updates.items():
+                        setattr(recipe, field, value)
+                    if 'ingredients' in updates:
+                        recipe.parsed_ingredients = parse_ingredient_rows(updates['ingredients'])
+
+        if args.apply:
+            db.session.commit()
+            for recipe_id in updated_ids:
+                forget_recipe_contents(recipe_id)
+        elapsed = time.time() - start_time
+        print(f"✅ {len(jobs)} snapshots in {elapsed:.1f}s: {changed} recipes "
+              f"{'updated' if args.apply else 'would change'}, {failed} failed.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from ingredient_parser import SINGULAR_ENDINGS, UNCOUNTABLE, singularize, split_quantity
+
+# Units that convert into each other, as multiples of the family's base unit,
+# largest first. When scaling, an amount is re-expressed in the largest unit
+# that reads naturally (see choose_unit).
+UNIT_FAMILIES = {
+    'volume': {'gallon': 768, 'quart': 192, 'pint': 96, 'cup': 48, 'fl oz': 6, 'tbsp': 3, 'tsp': 1},
+    'metric_mass': {'kg': 1000, 'g': 1},
+    'metric_volume': {'l': 1000, 'ml': 1},
+    'imperial_mass': {'lb': 16, 'oz': 1},
+}
+UNIT_FAMILY = {unit: family for family, units in UNIT_FAMILIES.items() for unit in units}
+# Smallest amount worth writing in a unit: '1/4 cup' reads fine, '1/8 cup' doesn't
+MIN_AMOUNT = {'gallon': 1, 'quart': 1, 'pint': 1, 'cup': 0.25, 'fl oz': 1, 'tbsp': 1, 'kg': 1, 'l': 1, 'lb': 1}
+# Only kept when a line already uses them: scaling '4 cups flour' shouldn't give '1 quart flour'
+NO_PROMOTION_UNITS = {'gallon', 'quart', 'pint', 'fl oz'}
+# Metric amounts are written as decimals rather than kitchen fractions
+DECIMAL_UNITS = {'g', 'kg', 'ml', 'l', 'mg'}
+
+NICE_FRACTIONS = [(0, ''), (1 / 8, '1/8'), (1 / 4, '1/4'), (1 / 3, '1/3'), (3 / 8, '3/8'), (1 / 2, '1/2'),
+                  (5 / 8, '5/8'), (2 / 3, '2/3'), (3 / 4, '3/4'), (7 / 8, '7/8'), (1, '')]
+# Larger units only take amounts on these steps: '1 1/2 tbsp' yes, '1 1/3 tbsp' no
+UNIT_STEPS = {'tbsp': 0.5, 'lb': 0.25}
+# Relative error allowed when promoting to a larger unit, so 5 tbsp stays
+# '5 tbsp' instead of becoming an approximate '1/3 cup'
+PROMOTION_TOLERANCE = 0.02
+
+# Lines that are seasoned or garnished by eye rather than measured
+NON_SCALABLE = re.compile(
+    r"\b(?:to taste|for garnish|for serving|to serve|as needed|do not scale|don't scale|not scaled)\b",
+    re.IGNORECASE)
+NON_SCALABLE_UNITS = {'pinch', 'dash'}
+
+PLURAL_UNITS = {'cup': 'cups', 'pinch': 'pinches', 'dash': 'dashes', 'clove': 'cloves', 'can': 'cans',
+                'package': 'packages', 'stick': 'sticks', 'slice': 'slices', 'bunch': 'bunches',
+                'sprig': 'sprigs', 'handful': 'handfuls', 'piece': 'pieces', 'leaf': 'leaves',
+                'pint': 'pints', 'quart': 'quarts', 'gallon': 'gallons'}
+
+# Nouns taking '-es' after an 'o'; other words ending in 'o' just take '-s' (avocados)
+ES_PLURALS = {'tomato', 'potato', 'mango'}
+IRREGULAR_PLURALS = {'leaf': 'leaves', 'loaf': 'loaves', 'half': 'halves'}
+# Head noun of a unitless line: the last word before any comma or parenthetical
+HEAD_NOUN = re.compile(r'^(?P<head>[^,(]*?)(?P<noun>[A-Za-z]{3,})(?P<tail>\s*(?:[,(].*)?)$')
+
+
+def nearest_fraction(value):
+    """Return (rounded value, whole part, fraction label) using kitchen fractions."""
+    whole = int(value)
+    fraction, label = min(NICE_FRACTIONS, key=lambda item: abs(item[0] - (value - whole)))
+    if fraction == 1:
+        whole, label = whole + 1, ''
+    return whole + (fraction % 1), whole, label
+
+
+def format_quantity(value, unit=None):
+    """1.5 -> '1 1/2', 0.333 -> '1/3', 1250 g -> '1250'."""
+    if unit in DECIMAL_UNITS or value >= 10:
+        return f'{round(value, 2 if value < 10 else 0):g}'
+    _, whole, label = nearest_fraction(value)
+    if whole and label:
+        return f'{whole} {label}'
+    return label or str(whole)
+
+
+def unit_label(unit, quantity):
+    if unit and quantity > 1:
+        return PLURAL_UNITS.get(unit, unit)
+    return unit
+
+
+def pluralize(word):
+    if word.endswith(SINGULAR_ENDINGS) or word in UNCOUNTABLE:
+        return word
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if word.endswith('y') and word[-2:-1] not in 'aeiou':
+        return word[:-1] + 'ies'
+    if word.endswith(('ch', 'sh', 'x')) or word in ES_PLURALS:
+        return word + 'es'
+    return word + 's'
+
+
+def count_noun_text(rest, quantity):
+    """Agree a unitless line's noun with its amount: '3' + 'egg' -> 'eggs', '1' + 'eggs' -> 'egg'."""
+    match = HEAD_NOUN.match(rest)
+    if not match:
+        return rest
+    noun = match.group('noun')
+    singular = singularize(noun)
+    # Leave alone mass nouns and words that only look plural ('molasses', 'asparagus'), and proper nouns
+    if noun != noun.lower() or singular in UNCOUNTABLE or singular.endswith(SINGULAR_ENDINGS):
+        return rest
+    noun = pluralize(singular) if quantity > 1 else singular
+    return f"{match.group('head')}{noun}{match.group('tail')}"
+
+
+def choose_unit(quantity, unit, exact=True):
+    """
+    Re-express an amount in the largest unit of its family that reads naturally.
+    With exact=False (shopping lists) the amount only has to clear the unit's
+    minimum; it will be rounded to a kitchen fraction when formatted.
+    """
+    family = UNIT_FAMILIES.get(UNIT_FAMILY.get(unit))
+    if not family:
+        return quantity, unit
+    base = quantity * family[unit]
+    for candidate, size in family.items():
+        amount = base / size
+        if amount < MIN_AMOUNT.get(candidate, 0) or (candidate in NO_PROMOTION_UNITS and candidate != unit):
+            continue
+        if exact and candidate not in DECIMAL_UNITS and size != min(family.values()):
+            step = UNIT_STEPS.get(candidate)
+            rounded = round(amount / step) * step if step else nearest_fraction(amount)[0]
+            if abs(rounded - amount) > amount * PROMOTION_TOLERANCE:
+                continue
+        return amount, candidate
+    return quantity, unit
+
+
+def ingredient_vector(text, quantity, quantity_max, unit, name):
+    """Everything scaling needs for one ingredient line, computed once per cache fill."""
+    rest = text
+    if quantity is not None:
+        _, _, _, rest, size_note = split_quantity(text)
+        if size_note:
+            rest = f'({size_note}) {rest}'
+    scalable = quantity is not None and unit not in NON_SCALABLE_UNITS and not NON_SCALABLE.search(text)
+    return {'text': text, 'quantity': quantity, 'quantity_max': quantity_max, 'unit': unit,
+            'name': name, 'rest': rest, 'scalable': scalable}
+
+
+def scale_vector(vector, factor, fixed_names=()):
+    """Scale one ingredient vector and render its line."""
+    if not vector['scalable'] or vector['name'] in fixed_names or factor == 1:
+        return {'text': vector['text'], 'name': vector['name'], 'quantity': vector['quantity'],
+                'quantity_max': vector['quantity_max'], 'unit': vector['unit'], 'scaled': False}
+
+    quantity, unit = choose_unit(vector['quantity'] * factor, vector['unit'])
+    quantity_max = None
+    if vector['quantity_max'] is not None:
+        # Keep both ends of a range in the unit chosen for the lower end
+        family = UNIT_FAMILIES.get(UNIT_FAMILY.get(vector['unit']))
+        quantity_max = vector['quantity_max'] * factor
+        if family:
+            quantity_max = quantity_max * family[vector['unit']] / family[unit]
+
+    amount = format_quantity(quantity, unit)
+    if quantity_max is not None:
+        amount = f'{amount}-{format_quantity(quantity_max, unit)}'
+    count = quantity_max if quantity_max is not None else quantity
+    rest = count_noun_text(vector['rest'], count) if unit is None else vector['rest']
+    text = ' '.join(part for part in (amount, unit_label(unit, count), rest) if part)
+    return {'text': text, 'name': vector['name'], 'quantity': round(quantity, 4),
+            'quantity_max': round(quantity_max, 4) if quantity_max is not None else None,
+            'unit': unit, 'scaled': True}
+
+
+def servings_count(servings):
+    """First number in a free-text servings field ('4', 'Serves 4-6'), or None."""
+    match = re.search(r'\d+(?:\.\d+)?', servings or '')
+    return float(match.group()) if match else None
+
+
+class QuantityVectorCache:
+    """
+    Per-worker LRU of each recipe's ingredient vectors, built from its
+    recipe_ingredient rows. Entries carry the recipe version they were built
+    for, so an edit made in another worker is never scaled from stale rows.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or int(os.environ.get('SCALING_CACHE_SIZE', '1024'))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, versions):
+        """Return ({recipe_id: vectors} for current entries, [recipe ids to load])."""
+        hits = {}
+        misses = []
+        with self._lock:
+            for recipe_id, version in versions.items():
+                entry = self._entries.get(recipe_id)
+                if entry is None or entry[0] != version:
+                    misses.append(recipe_id)
+                    continue
+                self._entries.move_to_end(recipe_id)
+                hits[recipe_id] = entry[1]
+        return hits, misses
+
+    def put(self, recipe_id, version, vectors):
+        with self._lock:
+            self._entries[recipe_id] = (version, vectors)
+            self._entries.move_to_end(recipe_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, recipe_id):
+        with self._lock:
+            self._entries.pop(recipe_id, None)
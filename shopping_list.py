@@ -0,0 +1,110 @@
+from ingredient_parser import parse_ingredient
+from scaling import UNIT_FAMILIES, UNIT_FAMILY, choose_unit, format_quantity, unit_label
+
+
+def base_unit(family):
+    return min(UNIT_FAMILIES[family], key=UNIT_FAMILIES[family].get)
+
+
+def amount_key(unit):
+    """Quantities in one unit family are summed together; any other unit (or none) stays separate."""
+    return UNIT_FAMILY.get(unit, unit)
+
+
+def to_base(quantity, unit):
+    family = UNIT_FAMILY.get(unit)
+    return quantity * UNIT_FAMILIES[family][unit] if family else quantity
+
+
+class ShoppingList:
+    """
+    Sum parsed ingredient rows across recipes, grouped by canonical name.
+    Amounts are kept per unit family in the family's base unit (tsp, g, ml,
+    oz), so '1 cup' and '2 tbsp' of the same ingredient add up while '2 cloves'
+    and '1 tbsp' of garlic are listed side by side.
+    """
+
+    def __init__(self):
+        self.items = {}
+
+    def _item(self, name):
+        return self.items.setdefault(name, {'amounts': {}, 'largest_units': {}, 'recipe_ids': set(), 'lines': [],
+                                            'unmeasured': False})
+
+    def add(self, recipe_id, text, quantity, quantity_max, unit, name, multiplier=1):
+        item = self._item(name)
+        item['recipe_ids'].add(recipe_id)
+        item['lines'].append(text)
+        if quantity is None:
+            item['unmeasured'] = True
+            return
+        key = amount_key(unit)
+        low, high = item['amounts'].get(key, (0.0, 0.0))
+        low += to_base(quantity, unit) * multiplier
+        high += to_base(quantity_max if quantity_max is not None else quantity, unit) * multiplier
+        item['amounts'][key] = (low, high)
+        # Remembered so '1 gallon milk' can come back as gallons rather than 16 cups
+        largest = item['largest_units'].get(key)
+        if unit in UNIT_FAMILY and (largest is None or to_base(1, unit) > to_base(1, largest)):
+            item['largest_units'][key] = unit
+
+    def subtract_pantry(self, pantry):
+        """
+        Remove what's already on hand. A bare name ('olive oil') drops the item;
+        an amount ('2 cups flour') is subtracted from compatible amounts.
+        Returns the names that no longer need buying.
+        """
+        covered = []
+        for line in pantry:
+            parsed = parse_ingredient(line)
+            item = self.items.get(parsed['name'])
+            if item is None:
+                continue
+            if parsed['quantity'] is None:
+                del self.items[parsed['name']]
+                covered.append(parsed['name'])
+                continue
+            key = amount_key(parsed['unit'])
+            if key not in item['amounts']:
+                continue
+            have = to_base(parsed['quantity'], parsed['unit'])
+            low, high = item['amounts'][key]
+            if high - have <= 0:
+                del item['amounts'][key]
+            else:
+                item['amounts'][key] = (max(low - have, 0.0), high - have)
+            if not item['amounts'] and not item['unmeasured']:
+                del self.items[parsed['name']]
+                covered.append(parsed['name'])
+        return covered
+
+    def to_list(self):
+        results = []
+        for name in sorted(self.items):
+            item = self.items[name]
+            amounts = []
+            for key, (low, high) in item['amounts'].items():
+                unit = item['largest_units'].get(key) or (base_unit(key) if key in UNIT_FAMILIES else key)
+                _, display_unit = choose_unit((low or high) / to_base(1, unit), unit, exact=False)
+                size = to_base(1, display_unit)
+                quantity = low / size
+                quantity_max = high / size if high != low else None
+                text = format_quantity(quantity, display_unit)
+                if quantity_max is not None:
+                    text = f'{text}-{format_quantity(quantity_max, display_unit)}'
+                label = unit_label(display_unit, quantity_max or quantity)
+                amounts.append({
+                    'quantity': round(quantity, 4),
+                    'quantity_max': round(quantity_max, 4) if quantity_max is not None else None,
+                    'unit': display_unit,
+                    'text': f'{text} {label}' if label else text,
+                })
+            results.append({
+                'name': name,
+                'amounts': amounts,
+                # Also listed for lines like 'salt to taste' that carry no quantity
+                'unmeasured': item['unmeasured'],
+                'recipe_ids': sorted(item['recipe_ids']),
+                'lines': item['lines'],
+            })
+        return results
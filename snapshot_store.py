@@ -0,0 +1,60 @@
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+
+DIGEST = re.compile(r'[0-9a-f]{64}')
+
+
+def is_digest(value):
+    """True for a SHA-256 hex digest as produced by SnapshotStore.put."""
+    return isinstance(value, str) and DIGEST.fullmatch(value) is not None
+
+
+class SnapshotStore:
+    """
+    Content-addressed store for rendered page HTML. Each snapshot is saved
+    gzip-compressed under its SHA-256, so re-extracting an unchanged page
+    costs nothing and recipes can reference snapshots by hash.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get('SNAPSHOT_DIR') or os.path.join(os.getcwd(), 'instance', 'snapshots')
+
+    def path_for(self, digest):
+        # Digests come back from clients, so never let one steer the path
+        if not is_digest(digest):
+            raise ValueError(f'Not a snapshot hash: {digest!r}')
+        return os.path.join(self.root, digest[:2], f'{digest[2:]}.html.gz')
+
+    def put(self, html):
+        """Store HTML and return its content hash."""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial snapshot
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest):
+        with open(self.path_for(digest), 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+
+    def exists(self, digest):
+        return is_digest(digest) and os.path.exists(self.path_for(digest))
+
+
+snapshot_store = SnapshotStore()
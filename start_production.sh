@@ -17,13 +17,9 @@ export FLASK_ENV=production
 mkdir -p instance
 mkdir -p chrome_profile
 
-# Initialize database if it doesn't exist
-python3 -c "
-from app import app, db
-with app.app_context():
-    db.create_all()
-    print('Database initialized successfully')
-"
+# Create the database or bring an existing one up to the current schema.
+# Every step is idempotent; the app's queries fail until this has run.
+python3 migrate_all.py || { echo "Database migration failed, not starting."; exit 1; }
 
 # Start the application with Gunicorn
 echo "Starting Gunicorn server..."
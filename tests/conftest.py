@@ -0,0 +1,5 @@
+import os
+
+# app.py reads DATABASE_URL at import time; the request validation under test
+# never reaches the database, so an in-memory SQLite URL is enough
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
@@ -0,0 +1,46 @@
+import pytest
+
+from ingredient_parser import MAX_NAME_LENGTH, canonical_name, parse_ingredient, parse_number
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('1 1/2', 1.5),
+    ('1-1/2', 1.5),
+    ('3/4', 0.75),
+    ('2.5', 2.5),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_unicode_fraction_unit_and_note():
+    assert parse_ingredient('1½ cups all-purpose flour, sifted') == {
+        'quantity': 1.5, 'quantity_max': None, 'unit': 'cup', 'name': 'all purpose flour', 'note': 'sifted'}
+
+
+@pytest.mark.parametrize('line, quantity, quantity_max, unit, name', [
+    ('2-3 cloves garlic', 2, 3, 'clove', 'garlic'),
+    ('1 to 2 tbsp olive oil', 1, 2, 'tbsp', 'olive oil'),
+    ('1-1/2 cups sugar', 1.5, None, 'cup', 'sugar'),
+    ('200g butter', 200, None, 'g', 'butter'),
+])
+def test_quantities_ranges_and_units(line, quantity, quantity_max, unit, name):
+    parsed = parse_ingredient(line)
+    assert (parsed['quantity'], parsed['quantity_max'], parsed['unit'], parsed['name']) == \
+        (quantity, quantity_max, unit, name)
+
+
+def test_unmeasured_line_keeps_its_name():
+    parsed = parse_ingredient('Salt and pepper')
+    assert parsed['quantity'] is None
+    assert parsed['name'] == 'salt and pepper'
+
+
+def test_section_heading_has_no_name():
+    assert parse_ingredient('For the sauce:')['name'] == ''
+
+
+def test_canonical_name_fits_the_column():
+    name = canonical_name(' '.join(['tomato'] * 100))
+    assert len(name) <= MAX_NAME_LENGTH
+    assert name.endswith('tomato')
@@ -0,0 +1,66 @@
+import pytest
+
+from app import app
+from ingredient_parser import parse_ingredient
+from scaling import choose_unit, count_noun_text, ingredient_vector, scale_vector
+
+
+def scaled_text(line, factor):
+    parsed = parse_ingredient(line)
+    vector = ingredient_vector(line, parsed['quantity'], parsed['quantity_max'], parsed['unit'], parsed['name'])
+    return scale_vector(vector, factor)['text']
+
+
+def test_six_tbsp_becomes_three_eighths_cup():
+    assert choose_unit(6, 'tbsp') == (0.375, 'cup')
+
+
+def test_five_tbsp_stays_in_tbsp():
+    # 5 tbsp is only roughly 1/3 cup, so it isn't promoted
+    assert choose_unit(5, 'tbsp') == (5, 'tbsp')
+
+
+def test_tbsp_only_on_half_steps():
+    # '1 1/3 tbsp' isn't a measure anyone has; 4 tsp is
+    assert choose_unit(4 / 3, 'tbsp') == pytest.approx((4, 'tsp'))
+
+
+def test_cups_are_not_promoted_to_quarts():
+    assert choose_unit(16, 'tbsp') == (1, 'cup')
+    assert scaled_text('4 cups flour', 4) == '16 cups flour'
+
+
+@pytest.mark.parametrize('line, factor, expected', [
+    ('1 egg', 3, '3 eggs'),
+    ('2 peaches', 0.5, '1 peach'),
+    ('4 cups flour', 1.5, '6 cups flour'),
+    ('3 tbsp butter', 2, '3/8 cup butter'),
+    ('2-3 cloves garlic', 2, '4-6 cloves garlic'),
+    ('200g butter', 1.5, '300 g butter'),
+    ('salt to taste', 2, 'salt to taste'),
+])
+def test_scaled_lines(line, factor, expected):
+    assert scaled_text(line, factor) == expected
+
+
+def test_mass_nouns_are_not_pluralized():
+    assert count_noun_text('molasses', 3) == 'molasses'
+
+
+@pytest.mark.parametrize('body', [
+    '{"recipe_ids": [1], "factor": NaN}',
+    '{"recipe_ids": [1], "factor": Infinity}',
+    '{"recipe_ids": [1], "servings": "nan"}',
+])
+def test_scale_rejects_non_finite_amounts(body):
+    response = app.test_client().post('/scale', data=body, content_type='application/json')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('body', [
+    '[1, 2]',
+    '{"recipe_ids": [1], "factor": 2, "fixed": "salt"}',
+])
+def test_scale_rejects_malformed_bodies(body):
+    response = app.test_client().post('/scale', data=body, content_type='application/json')
+    assert response.status_code == 400
@@ -0,0 +1,60 @@
+import pytest
+
+from app import app
+from ingredient_parser import parse_ingredient
+from shopping_list import ShoppingList
+
+
+def build(lines):
+    shopping = ShoppingList()
+    for recipe_id, line in lines:
+        parsed = parse_ingredient(line)
+        shopping.add(recipe_id, line, parsed['quantity'], parsed['quantity_max'], parsed['unit'], parsed['name'])
+    return shopping
+
+
+def amounts(shopping, name):
+    return [amount['text'] for item in shopping.to_list() if item['name'] == name for amount in item['amounts']]
+
+
+def test_quart_plus_cup_reads_in_quarts():
+    shopping = build([(1, '1 quart milk'), (2, '1 cup milk')])
+    assert amounts(shopping, 'milk') == ['1 1/4 quarts']
+
+
+def test_incompatible_units_are_listed_separately():
+    shopping = build([(1, '2 cloves garlic'), (2, '1 tbsp garlic')])
+    assert sorted(amounts(shopping, 'garlic')) == ['1 tbsp', '2 cloves']
+
+
+def test_pantry_amount_is_subtracted():
+    shopping = build([(1, '2 cups flour')])
+    assert shopping.subtract_pantry(['1 cup flour']) == []
+    assert amounts(shopping, 'flour') == ['1 cup']
+
+
+def test_pantry_name_covers_item():
+    shopping = build([(1, '2 tbsp olive oil'), (2, 'salt to taste')])
+    assert shopping.subtract_pantry(['olive oil']) == ['olive oil']
+    assert [item['name'] for item in shopping.to_list()] == ['salt']
+
+
+@pytest.mark.parametrize('body', [
+    '{"recipes": [{"id": 1, "multiplier": NaN}]}',
+    '{"recipes": [{"id": 1, "multiplier": Infinity}]}',
+    '{"recipes": [{"id": 1, "multiplier": "nan"}]}',
+])
+def test_shopping_list_rejects_non_finite_multipliers(body):
+    response = app.test_client().post('/shopping_list', data=body, content_type='application/json')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('body', [
+    '[1, 2]',
+    '{"recipe_ids": "1,2"}',
+    '{"recipe_ids": [1], "pantry": "flour"}',
+    '{"recipe_ids": [1], "pantry": [1]}',
+])
+def test_shopping_list_rejects_malformed_bodies(body):
+    response = app.test_client().post('/shopping_list', data=body, content_type='application/json')
+    assert response.status_code == 400
@@ -3,8 +3,13 @@
 WSGI entry point for production deployment
 """
 from app import app, db
+from browser_watchdog import browser_watchdog
 import os
 
+# Each gunicorn worker imports this module: reap Chrome left behind by killed
+# workers and start enforcing per-browser memory/time limits
+browser_watchdog.start()
+
 if os.environ.get("FLASK_ENV") == "development":
     with app.app_context():
         db.create_all()